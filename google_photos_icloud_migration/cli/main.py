@@ -5,11 +5,13 @@ import argparse
 import json
 import logging
 import os
+import shutil
 import sys
 import time
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 import yaml
 import jsonschema
 from tqdm import tqdm
@@ -27,14 +29,24 @@ from google_photos_icloud_migration.processor.metadata_merger import MetadataMer
 from google_photos_icloud_migration.parser.album_parser import AlbumParser
 from google_photos_icloud_migration.uploader.icloud_uploader import iCloudPhotosSyncUploader
 from google_photos_icloud_migration.exceptions import ConfigurationError, ExtractionError, CorruptedZipException
-from google_photos_icloud_migration.config import MigrationConfig
+from google_photos_icloud_migration.config import MigrationConfig, YamlSafeLoader
+from google_photos_icloud_migration.utils.file_ops import directory_size, remove_tree, unlink_files
+from google_photos_icloud_migration.utils.json_io import read_json, write_json
 from google_photos_icloud_migration.utils.logging_config import setup_logging
+from google_photos_icloud_migration.utils.parallel import parallel_map_with_results
 from google_photos_icloud_migration.utils.state_manager import (
     StateManager, FileProcessingState, ZipProcessingState
 )
 
 logger = logging.getLogger(__name__)
 
+# Disk space needed per zip while it is processed: the zip itself plus its
+# extracted and processed copies
+ZIP_WORKING_SPACE_FACTOR = 2.5
+
+# Separator line logged around section banners
+_BANNER = "=" * 60
+
 
 class MigrationStoppedException(Exception):
     """Exception raised when user chooses to stop migration."""
@@ -100,8 +112,23 @@ class MigrationOrchestrator:
                 preserve_descriptions=metadata_config['preserve_descriptions']
             )
         
+        # Working directories for each stage
+        processing_config = self.config['processing']
+        self._zip_dir = self.base_dir / processing_config['zip_dir']
+        self._extracted_dir = self.base_dir / processing_config['extracted_dir']
+        self._processed_dir = self.base_dir / processing_config['processed_dir']
+        
+        # Processing settings used per zip / per batch
+        self._batch_size = processing_config['batch_size']
+        self._cleanup_after_upload = processing_config.get('cleanup_after_upload', False)
+        self._max_disk_space_gb = processing_config.get('max_disk_space_gb')
+        self._max_workers = processing_config.get('max_workers') or min(8, os.cpu_count() or 4)
+        
         # Initialize extractor (same for both)
-        self.extractor = Extractor(self.base_dir)
+        self.extractor = Extractor(
+            self.base_dir,
+            deep_validation=processing_config.get('deep_zip_validation', False)
+        )
         
         # Initialize album parser
         self.album_parser = AlbumParser()
@@ -124,6 +151,22 @@ class MigrationOrchestrator:
         # Verification failure handling
         self.ignore_all_verification_failures = False
         
+        # Zips with failed uploads in this run (kept on disk for retry)
+        self._zips_with_failed_uploads: Set[str] = set()
+        
+        # Zips already validated up front (skip re-validation at extraction)
+        self._validated_zips: Set[str] = set()
+        
+        # Pool for background I/O (one prefetch plus zip deletions), created per run()
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        
+        # Background download of the next zip while the current one is processed
+        self._next_zip_future: Optional[Future] = None
+        self._next_zip_name: Optional[str] = None
+        
+        # Background deletion of processed zip files
+        self._pending_zip_deletions: List[Future] = []
+        
         # Continue prompt handling
         self._skip_continue_prompts = False
         self._restart_requested = False
@@ -155,6 +198,9 @@ class MigrationOrchestrator:
                 'processed_dir': config.processing.processed_dir,
                 'batch_size': config.processing.batch_size,
                 'cleanup_after_upload': config.processing.cleanup_after_upload,
+                'max_workers': config.processing.max_workers,
+                'max_disk_space_gb': config.processing.max_disk_space_gb,
+                'deep_zip_validation': config.processing.deep_zip_validation,
             },
             'metadata': {
                 'preserve_dates': config.metadata.preserve_dates,
@@ -173,7 +219,7 @@ class MigrationOrchestrator:
         # Load YAML config
         try:
             with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlSafeLoader)
         except (yaml.YAMLError, IOError, OSError) as e:
             raise ConfigurationError(f"Failed to load configuration file '{config_path}': {e}") from e
         
@@ -295,6 +341,26 @@ class MigrationOrchestrator:
                 handlers=[logging.StreamHandler(sys.stdout)]
             )
     
+    @staticmethod
+    def _list_file_names(directory: Path) -> Set[str]:
+        """
+        List the names of entries in a directory with a single scandir pass.
+        
+        Used instead of per-file exists() checks when many files in the same
+        directory need to be tested.
+        
+        Args:
+            directory: Directory to list
+        
+        Returns:
+            Set of entry names (empty if the directory does not exist)
+        """
+        try:
+            with os.scandir(directory) as it:
+                return {entry.name for entry in it}
+        except FileNotFoundError:
+            return set()
+    
     def download_zip_files(self) -> List[Path]:
         """
         Download all zip files from Google Drive.
@@ -302,12 +368,12 @@ class MigrationOrchestrator:
         Returns:
             List of downloaded zip file paths
         """
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Phase 1: Downloading zip files from Google Drive")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
         drive_config = self.config['google_drive']
-        zip_dir = self.base_dir / self.config['processing']['zip_dir']
+        zip_dir = self._zip_dir
         
         zip_files = self.downloader.download_all_zips(
             destination_dir=zip_dir,
@@ -328,9 +394,9 @@ class MigrationOrchestrator:
         Returns:
             List of extracted directory paths
         """
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Phase 2: Extracting zip files")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
         # Use list method for backward compatibility
         extracted_dirs = self.extractor.extract_all_zips_list(zip_files)
@@ -348,9 +414,9 @@ class MigrationOrchestrator:
         Returns:
             Dictionary mapping media files to JSON metadata files
         """
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Phase 3: Processing metadata")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
         # Collect all media/JSON pairs
         all_pairs = {}
@@ -362,11 +428,11 @@ class MigrationOrchestrator:
         logger.info(f"Found {len(all_pairs)} media files to process")
         
         # Merge metadata
-        processed_dir = self.base_dir / self.config['processing']['processed_dir']
+        processed_dir = self._processed_dir
         processed_dir.mkdir(parents=True, exist_ok=True)
         
         # Process in batches
-        batch_size = self.config['processing']['batch_size']
+        batch_size = self._batch_size
         all_files = list(all_pairs.keys())
         
         for i in range(0, len(all_files), batch_size):
@@ -377,11 +443,11 @@ class MigrationOrchestrator:
             self.metadata_merger.merge_all_metadata(batch_pairs, output_dir=processed_dir)
         
         # Update pairs to point to processed files
+        processed_names = self._list_file_names(processed_dir)
         processed_pairs = {}
         for media_file, json_file in all_pairs.items():
-            processed_file = processed_dir / media_file.name
-            if processed_file.exists():
-                processed_pairs[processed_file] = json_file
+            if media_file.name in processed_names:
+                processed_pairs[processed_dir / media_file.name] = json_file
             else:
                 # Fallback to original if processing failed
                 processed_pairs[media_file] = json_file
@@ -400,9 +466,9 @@ class MigrationOrchestrator:
         Returns:
             Dictionary mapping album names to file lists
         """
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Phase 4: Parsing album structures")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
         # Parse from directory structure
         for extracted_dir in extracted_dirs:
@@ -459,25 +525,19 @@ class MigrationOrchestrator:
         Returns:
             Dictionary mapping file paths to upload success status
         """
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Phase 5: Uploading to iCloud Photos")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
         if self.icloud_uploader is None:
             raise RuntimeError("iCloud uploader not initialized. Call setup_icloud_uploader() first.")
         
         # Build file-to-album mapping
-        file_to_album = {}
-        for album_name, files in albums.items():
-            for file_path in files:
-                file_to_album[file_path] = album_name
-        
-        # Create verification failure callback
-        def verification_failure_callback(failed_file_path: Path):
-            """Callback for handling verification failures."""
-            action = self._handle_verification_failure(failed_file_path)
-            if action == 'stop':
-                raise MigrationStoppedException(f"Migration stopped by user due to verification failure for {failed_file_path.name}")
+        file_to_album = {
+            file_path: album_name
+            for album_name, files in albums.items()
+            for file_path in files
+        }
         
         # Upload files
         all_files = list(media_json_pairs.keys())
@@ -487,22 +547,22 @@ class MigrationOrchestrator:
             all_files,
             albums=file_to_album,
             verify_after_upload=True,
-            on_verification_failure=verification_failure_callback
+            on_verification_failure=self._on_verification_failure
         )
         
-        successful = sum(1 for v in results.values() if v)
-        failed_count = len(results) - successful
+        failed_files = [str(path) for path, success in results.items() if not success]
+        failed_count = len(failed_files)
+        successful = len(results) - failed_count
         logger.info(f"Uploaded {successful}/{len(results)} files to iCloud Photos")
         
         # Save failed uploads for retry
         if failed_count > 0:
-            failed_files = [str(path) for path, success in results.items() if not success]
             self._save_failed_uploads(failed_files, albums)
-            logger.warning("=" * 60)
+            logger.warning(_BANNER)
             logger.warning(f"⚠️  {failed_count} files failed to upload")
             logger.warning(f"Failed uploads saved to: {self.failed_uploads_file}")
             logger.warning("You can retry failed uploads using: --retry-failed")
-            logger.warning("=" * 60)
+            logger.warning(_BANNER)
         
         return results
     
@@ -525,9 +585,9 @@ class MigrationOrchestrator:
         
         # Interactive mode - ask user
         logger.info("")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("PROCEED WITH CLEANUP?")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("You have retried failed uploads (or chosen to proceed anyway).")
         logger.info("")
         logger.info("What would you like to do?")
@@ -577,9 +637,9 @@ class MigrationOrchestrator:
         
         if tracking_exists:
             logger.info("")
-            logger.info("=" * 60)
+            logger.info(_BANNER)
             logger.info("UPLOAD TRACKING FILE FOUND")
-            logger.info("=" * 60)
+            logger.info(_BANNER)
             logger.info(f"Found existing upload tracking file: {self.upload_tracking_file}")
             logger.info("This file tracks which photos/videos have already been uploaded.")
             logger.info("")
@@ -605,9 +665,9 @@ class MigrationOrchestrator:
                     return True
         else:
             logger.info("")
-            logger.info("=" * 60)
+            logger.info(_BANNER)
             logger.info("NEW MIGRATION DETECTED")
-            logger.info("=" * 60)
+            logger.info(_BANNER)
             logger.info("No upload tracking file found. This appears to be a new migration.")
             logger.info("Upload tracking will be created to prevent duplicate uploads.")
             logger.info("")
@@ -640,10 +700,10 @@ class MigrationOrchestrator:
         
         remaining = total_zips - processed_count
         logger.info("")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info(f"Completed processing zip {processed_count}/{total_zips}")
         logger.info(f"Remaining: {remaining} zip file(s)")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("")
         logger.info("What would you like to do?")
         logger.info("  (C) Continue - Process the next zip file")
@@ -677,6 +737,20 @@ class MigrationOrchestrator:
                 logger.warning("Input interrupted. Stopping migration.")
                 return False
     
+    def _on_verification_failure(self, failed_file_path: Path):
+        """
+        Callback for handling verification failures during uploads.
+        
+        Args:
+            failed_file_path: Path to the file that failed verification
+        
+        Raises:
+            MigrationStoppedException: If the user chooses to stop the migration
+        """
+        action = self._handle_verification_failure(failed_file_path)
+        if action == 'stop':
+            raise MigrationStoppedException(f"Migration stopped by user due to verification failure for {failed_file_path.name}")
+    
     def _handle_verification_failure(self, file_path: Path) -> str:
         """
         Handle verification failure by prompting the user.
@@ -690,9 +764,9 @@ class MigrationOrchestrator:
         if self.ignore_all_verification_failures:
             return 'ignore_all'
         
-        logger.warning("=" * 60)
+        logger.warning(_BANNER)
         logger.warning(f"⚠️  Upload verification failed for: {file_path.name}")
-        logger.warning("=" * 60)
+        logger.warning(_BANNER)
         logger.warning("The file may not have been successfully uploaded to iCloud.")
         logger.warning("")
         logger.warning("What would you like to do?")
@@ -728,8 +802,7 @@ class MigrationOrchestrator:
         existing_failed = {}
         if self.failed_uploads_file.exists():
             try:
-                with open(self.failed_uploads_file, 'r') as f:
-                    existing_failed = json.load(f)
+                existing_failed = read_json(self.failed_uploads_file)
             except (json.JSONDecodeError, IOError) as e:
                 logger.warning(f"Could not read existing failed uploads file: {e}")
                 existing_failed = {}
@@ -746,8 +819,7 @@ class MigrationOrchestrator:
         
         # Save updated failed uploads
         try:
-            with open(self.failed_uploads_file, 'w') as f:
-                json.dump(existing_failed, f, indent=2)
+            write_json(self.failed_uploads_file, existing_failed)
         except IOError as e:
             logger.error(f"Could not save failed uploads file: {e}")
     
@@ -764,8 +836,7 @@ class MigrationOrchestrator:
         existing_corrupted = {}
         if self.corrupted_zips_file.exists():
             try:
-                with open(self.corrupted_zips_file, 'r') as f:
-                    existing_corrupted = json.load(f)
+                existing_corrupted = read_json(self.corrupted_zips_file)
             except (json.JSONDecodeError, IOError) as e:
                 logger.warning(f"Could not read existing corrupted zips file: {e}")
                 existing_corrupted = {}
@@ -787,8 +858,7 @@ class MigrationOrchestrator:
         
         # Save updated corrupted zips
         try:
-            with open(self.corrupted_zips_file, 'w') as f:
-                json.dump(existing_corrupted, f, indent=2)
+            write_json(self.corrupted_zips_file, existing_corrupted)
             logger.warning(f"⚠️  Corrupted zip file saved to: {self.corrupted_zips_file}")
             logger.warning(f"   File: {file_name}")
             logger.warning(f"   You can re-download it later from Google Drive")
@@ -806,14 +876,13 @@ class MigrationOrchestrator:
             logger.info("No failed uploads file found. Nothing to retry.")
             return {}
         
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Retrying failed uploads")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
         # Load failed uploads
         try:
-            with open(self.failed_uploads_file, 'r') as f:
-                failed_data = json.load(f)
+            failed_data = read_json(self.failed_uploads_file)
         except (json.JSONDecodeError, IOError) as e:
             logger.error(f"Could not read failed uploads file: {e}")
             return {}
@@ -842,28 +911,21 @@ class MigrationOrchestrator:
                 files_by_album[album_name] = []
             files_by_album[album_name].append(file_path)
         
-        # Upload files
-        results = {}
-        file_to_album = {}
-        for album_name, files in files_by_album.items():
-            for file_path in files:
-                file_to_album[file_path] = album_name
-        
-        # Create verification failure callback
-        def verification_failure_callback(failed_file_path: Path):
-            """Callback for handling verification failures."""
-            action = self._handle_verification_failure(failed_file_path)
-            if action == 'stop':
-                raise MigrationStoppedException(f"Migration stopped by user due to verification failure for {failed_file_path.name}")
+        # Build file-to-album mapping (dict order gives the upload order)
+        file_to_album = {
+            file_path: album_name
+            for album_name, files in files_by_album.items()
+            for file_path in files
+        }
         
-        all_files = [f for files in files_by_album.values() for f in files]
+        all_files = list(file_to_album)
         
         # Always use PhotoKit sync method upload
         results = self.icloud_uploader.upload_files_batch(
             all_files,
             albums=file_to_album,
             verify_after_upload=True,
-            on_verification_failure=verification_failure_callback
+            on_verification_failure=self._on_verification_failure
         )
         
         # Update failed uploads file (remove successful ones)
@@ -880,12 +942,11 @@ class MigrationOrchestrator:
         
         # Save updated failed uploads
         try:
-            with open(self.failed_uploads_file, 'w') as f:
-                json.dump(remaining_failed, f, indent=2)
+            write_json(self.failed_uploads_file, remaining_failed)
         except IOError as e:
             logger.error(f"Could not update failed uploads file: {e}")
         
-        successful = sum(1 for v in results.values() if v)
+        successful = len(successful_files)
         logger.info(f"Retried: {successful}/{len(results)} files succeeded")
         
         if len(remaining_failed) > 0:
@@ -907,9 +968,9 @@ class MigrationOrchestrator:
         Returns:
             Dictionary mapping zip names to extraction success status
         """
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Retrying failed extractions")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
         failed_zips = self.state_manager.get_zips_by_state(ZipProcessingState.FAILED_EXTRACTION)
         
@@ -919,7 +980,7 @@ class MigrationOrchestrator:
         
         logger.info(f"Found {len(failed_zips)} zip files with failed extractions")
         
-        zip_dir = self.base_dir / self.config['processing']['zip_dir']
+        zip_dir = self._zip_dir
         results = {}
         
         for zip_name in failed_zips:
@@ -955,9 +1016,9 @@ class MigrationOrchestrator:
         Returns:
             Dictionary mapping file paths to conversion success status
         """
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Retrying failed conversions")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
         failed_files = self.state_manager.get_files_by_state(FileProcessingState.FAILED_CONVERSION)
         
@@ -982,7 +1043,7 @@ class MigrationOrchestrator:
             files_by_zip[zip_name].append(file_path)
         
         results = {}
-        processed_dir = self.base_dir / self.config['processing']['processed_dir']
+        processed_dir = self._processed_dir
         processed_dir.mkdir(parents=True, exist_ok=True)
         
         for zip_name, files in files_by_zip.items():
@@ -1006,7 +1067,6 @@ class MigrationOrchestrator:
                     
                     # Copy file if needed
                     if not processed_file.exists():
-                        import shutil
                         shutil.copy2(file_path, processed_file)
                     
                     # Merge metadata
@@ -1036,9 +1096,9 @@ class MigrationOrchestrator:
         Returns:
             Dictionary mapping file paths to copy success status
         """
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Retrying failed Photos library copies")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         
         failed_files = self.state_manager.get_files_by_state(FileProcessingState.FAILED_PHOTOS_COPY)
         
@@ -1124,28 +1184,26 @@ class MigrationOrchestrator:
     
     def _do_final_cleanup(self):
         """Perform final cleanup of processed files."""
-        if self.config['processing'].get('cleanup_after_upload', False):
-            logger.info("=" * 60)
+        if self._cleanup_after_upload:
+            logger.info(_BANNER)
             logger.info("Final cleanup")
-            logger.info("=" * 60)
-            processed_dir = self.base_dir / self.config['processing']['processed_dir']
+            logger.info(_BANNER)
+            processed_dir = self._processed_dir
             if processed_dir.exists():
-                import shutil
                 logger.info(f"Removing processed files: {processed_dir}")
-                shutil.rmtree(processed_dir)
+                remove_tree(processed_dir)
     
     def cleanup(self):
         """Clean up temporary files."""
-        if self.config['processing'].get('cleanup_after_upload', False):
-            logger.info("=" * 60)
+        if self._cleanup_after_upload:
+            logger.info(_BANNER)
             logger.info("Phase 6: Cleanup")
-            logger.info("=" * 60)
+            logger.info(_BANNER)
             
-            extracted_dir = self.base_dir / self.config['processing']['extracted_dir']
+            extracted_dir = self._extracted_dir
             if extracted_dir.exists():
-                import shutil
                 logger.info(f"Removing extracted files: {extracted_dir}")
-                shutil.rmtree(extracted_dir)
+                remove_tree(extracted_dir)
     
     def process_single_zip(self, zip_path: Path, zip_number: int, total_zips: int, 
                            file_info: Optional[dict] = None) -> bool:
@@ -1162,14 +1220,16 @@ class MigrationOrchestrator:
             True if successful, False otherwise
         """
         zip_name = zip_path.name
+        # Write state once per zip instead of on every file state change
+        self.state_manager.begin_batch()
         try:
-            logger.info("=" * 60)
-            logger.info(f"Processing zip {zip_number}/{total_zips}: {zip_name}")
-            logger.info("=" * 60)
+            logger.info(_BANNER)
+            logger.info("Processing zip %d/%d: %s", zip_number, total_zips, zip_name)
+            logger.info(_BANNER)
             
             # Check if zip is already complete
             if self.state_manager.is_zip_complete(zip_name):
-                logger.info(f"⏭️  Skipping {zip_name} - already fully processed")
+                logger.info("⏭️  Skipping %s - already fully processed", zip_name)
                 return True
             
             # Set checkpoint
@@ -1183,16 +1243,18 @@ class MigrationOrchestrator:
                 extracted_dir_str = zip_state.get('extracted_dir')
                 if extracted_dir_str and Path(extracted_dir_str).exists():
                     extracted_dir = Path(extracted_dir_str)
-                    logger.info(f"⏭️  Zip {zip_name} already extracted, using existing extraction")
+                    logger.info("⏭️  Zip %s already extracted, using existing extraction", zip_name)
                 else:
-                    logger.info(f"Zip {zip_name} marked as extracted but directory missing, re-extracting")
+                    logger.info("Zip %s marked as extracted but directory missing, re-extracting", zip_name)
             
             if extracted_dir is None:
                 try:
-                    logger.info(f"Extracting {zip_name}...")
-                    extracted_dir = self.extractor.extract_zip(zip_path)
+                    logger.info("Extracting %s...", zip_name)
+                    extracted_dir = self.extractor.extract_zip(
+                        zip_path, validate=zip_name not in self._validated_zips
+                    )
                     self.state_manager.mark_zip_extracted(zip_name, str(extracted_dir))
-                    logger.info(f"✓ Extracted {zip_name}")
+                    logger.info("✓ Extracted %s", zip_name)
                 except ExtractionError as e:
                     # Handle corrupted zip file - raise CorruptedZipException to stop and prompt user
                     error_msg = str(e)
@@ -1250,9 +1312,9 @@ class MigrationOrchestrator:
             self.state_manager.set_checkpoint('convert', zip_name=zip_name)
             
             # Process metadata for this zip
-            logger.info(f"Identifying media files in {zip_name}...")
+            logger.info("Identifying media files in %s...", zip_name)
             media_json_pairs = self.extractor.identify_media_json_pairs(extracted_dir)
-            logger.info(f"Found {len(media_json_pairs)} media files in this zip")
+            logger.info("Found %d media files in this zip", len(media_json_pairs))
             
             if not media_json_pairs:
                 logger.warning(f"No media files found in {zip_name}, skipping")
@@ -1264,42 +1326,46 @@ class MigrationOrchestrator:
                 self.state_manager.mark_file_extracted(str(media_file), zip_name)
             
             # Merge metadata
-            processed_dir = self.base_dir / self.config['processing']['processed_dir']
+            processed_dir = self._processed_dir
             processed_dir.mkdir(parents=True, exist_ok=True)
+            # State keys for processed copies are built with string joins rather than Path objects
+            processed_dir_str = os.fspath(processed_dir)
             
             # Process metadata in batches
-            batch_size = self.config['processing']['batch_size']
+            batch_size = self._batch_size
             all_files = list(media_json_pairs.keys())
             
             # Check which files need conversion
+            processed_names = self._list_file_names(processed_dir)
+            get_file_state = self.state_manager.get_file_state
+            converted_state = FileProcessingState.CONVERTED.value
             files_to_convert = []
             for media_file in all_files:
-                processed_file = processed_dir / media_file.name
-                file_state = self.state_manager.get_file_state(str(media_file))
-                
                 # Skip if already converted and processed file exists
-                if file_state == FileProcessingState.CONVERTED.value and processed_file.exists():
-                    logger.debug(f"⏭️  Skipping conversion for {media_file.name} - already converted")
+                if get_file_state(str(media_file)) == converted_state and media_file.name in processed_names:
+                    logger.debug("⏭️  Skipping conversion for %s - already converted", media_file.name)
                     continue
                 
                 files_to_convert.append(media_file)
             
             if files_to_convert:
-                logger.info(f"Converting {len(files_to_convert)} files (skipping {len(all_files) - len(files_to_convert)} already converted)")
+                logger.info("Converting %d files (skipping %d already converted)", len(files_to_convert), len(all_files) - len(files_to_convert))
                 
                 for i in range(0, len(files_to_convert), batch_size):
                     batch = files_to_convert[i:i + batch_size]
                     batch_pairs = {f: media_json_pairs[f] for f in batch}
-                    logger.info(f"Processing metadata batch {i // batch_size + 1}/{(len(files_to_convert) + batch_size - 1) // batch_size}")
+                    logger.info("Processing metadata batch %d/%d", i // batch_size + 1, (len(files_to_convert) + batch_size - 1) // batch_size)
                     
                     try:
                         self.metadata_merger.merge_all_metadata(batch_pairs, output_dir=processed_dir)
                         
-                        # Mark files as converted
+                        # Mark files as converted (one directory listing per batch, not one stat per file)
+                        batch_processed_names = self._list_file_names(processed_dir)
                         for media_file in batch:
-                            processed_file = processed_dir / media_file.name
-                            if processed_file.exists():
-                                self.state_manager.mark_file_converted(str(processed_file), zip_name)
+                            if media_file.name in batch_processed_names:
+                                self.state_manager.mark_file_converted(
+                                    os.path.join(processed_dir_str, media_file.name), zip_name
+                                )
                             else:
                                 # If processed file doesn't exist, mark original as converted
                                 self.state_manager.mark_file_converted(str(media_file), zip_name)
@@ -1314,7 +1380,7 @@ class MigrationOrchestrator:
                                 str(e)
                             )
             else:
-                logger.info(f"All files in {zip_name} already converted")
+                logger.info("All files in %s already converted", zip_name)
             
             # Mark zip as converted
             self.state_manager.mark_zip_converted(zip_name)
@@ -1338,95 +1404,97 @@ class MigrationOrchestrator:
                 for file_path in files:
                     original_file_to_album[file_path] = album_name
             
-            # Get processed files and build mapping from processed files to albums
-            processed_files = []
-            file_to_album = {}  # Maps processed/original file paths to album names
-            for media_file in media_json_pairs.keys():
-                processed_file = processed_dir / media_file.name
-                if processed_file.exists():
-                    processed_files.append(processed_file)
-                    # Map processed file to album using original file's album
-                    album_name = original_file_to_album.get(media_file, '')
-                    if album_name:
-                        file_to_album[processed_file] = album_name
-                else:
-                    processed_files.append(media_file)
-                    # Map original file to album
-                    album_name = original_file_to_album.get(media_file, '')
-                    if album_name:
-                        file_to_album[media_file] = album_name
-            
-            # Create verification failure callback
-            def verification_failure_callback(failed_file_path: Path):
-                """Callback for handling verification failures."""
-                action = self._handle_verification_failure(failed_file_path)
-                if action == 'stop':
-                    raise RuntimeError(f"Migration stopped by user due to verification failure for {failed_file_path.name}")
+            # Get processed files (or the original when no processed copy exists)
+            processed_names = self._list_file_names(processed_dir)
+            upload_sources = [
+                (processed_dir / media_file.name if media_file.name in processed_names else media_file,
+                 media_file)
+                for media_file in media_json_pairs
+            ]
+            processed_files = [target for target, _ in upload_sources]
+            
+            # Map processed/original file paths to album names using the original file's album
+            album_get = original_file_to_album.get
+            file_to_album = {
+                target: album_name
+                for target, media_file in upload_sources
+                if (album_name := album_get(media_file))
+            }
             
             # Filter out files that are already uploaded
+            get_file_state = self.state_manager.get_file_state
+            synced_state = FileProcessingState.SYNCED_TO_ICLOUD.value
             files_to_upload = []
             for file_path in processed_files:
-                file_state = self.state_manager.get_file_state(str(file_path))
-                if file_state == FileProcessingState.SYNCED_TO_ICLOUD.value:
-                    logger.debug(f"⏭️  Skipping {file_path.name} - already synced to iCloud")
+                if get_file_state(str(file_path)) == synced_state:
+                    logger.debug("⏭️  Skipping %s - already synced to iCloud", file_path.name)
                     continue
                 files_to_upload.append(file_path)
             
             if not files_to_upload:
-                logger.info(f"All files in {zip_name} already uploaded")
+                logger.info("All files in %s already uploaded", zip_name)
                 self.state_manager.mark_zip_uploaded(zip_name)
                 self.state_manager.clear_checkpoint()
                 return True
             
-            logger.info(f"Uploading {len(files_to_upload)} files from {zip_name} (skipping {len(processed_files) - len(files_to_upload)} already uploaded)")
+            logger.info("Uploading %d files from %s (skipping %d already uploaded)", len(files_to_upload), zip_name, len(processed_files) - len(files_to_upload))
             
             # Upload
             upload_results = {}
             # Always use PhotoKit sync method upload
-            logger.info(f"Copying {len(files_to_upload)} files to Photos library...")
+            logger.info("Copying %d files to Photos library...", len(files_to_upload))
             upload_results = self.icloud_uploader.upload_files_batch(
                 files_to_upload,
                 albums=file_to_album,
                 verify_after_upload=True,
-                on_verification_failure=verification_failure_callback
+                on_verification_failure=self._on_verification_failure
             )
             
-            # Update state for uploaded files
+            # Update state for uploaded files, collecting processed copies to clean up
+            # and failed files to retry in the same pass
+            get_asset_identifier = getattr(self.icloud_uploader, '_get_asset_identifier', None)
+            processed_to_cleanup = []
+            failed_files = []
             for file_path, success in upload_results.items():
+                file_key = str(file_path)
                 if success:
+                    # Only processed files (not original extracted files) are cleaned up later.
+                    # Processed copies are written flat into processed_dir.
+                    if os.path.dirname(file_key) == processed_dir_str:
+                        processed_to_cleanup.append(file_path)
                     # For Photos sync, mark as copied to Photos
                     # Get asset identifier if available
                     asset_id = None
-                    if hasattr(self.icloud_uploader, '_get_asset_identifier'):
+                    if get_asset_identifier is not None:
                         try:
-                            asset_id = self.icloud_uploader._get_asset_identifier(file_path)
+                            asset_id = get_asset_identifier(file_path)
                         except Exception:
                             pass
-                    self.state_manager.mark_file_copied_to_photos(str(file_path), zip_name, asset_id)
+                    self.state_manager.mark_file_copied_to_photos(file_key, zip_name, asset_id)
                     # Also mark as synced (Photos will sync automatically)
-                    self.state_manager.mark_file_synced_to_icloud(str(file_path), zip_name)
+                    self.state_manager.mark_file_synced_to_icloud(file_key, zip_name)
                 else:
+                    failed_files.append(file_key)
                     # Mark as failed upload
                     self.state_manager.mark_file_failed(
-                        str(file_path),
+                        file_key,
                         zip_name,
                         FileProcessingState.FAILED_UPLOAD,
                         "Upload failed"
                     )
             
-            successful = sum(1 for v in upload_results.values() if v)
-            failed_count = len(upload_results) - successful
-            logger.info(f"Uploaded {successful}/{len(upload_results)} files from {zip_name}")
+            failed_count = len(failed_files)
+            successful = len(upload_results) - failed_count
+            logger.info("Uploaded %d/%d files from %s", successful, len(upload_results), zip_name)
             
             # Save failed uploads for retry
-            failed_files = []
             if failed_count > 0:
-                failed_files = [str(path) for path, success in upload_results.items() if not success]
                 self._save_failed_uploads(failed_files, file_to_album)
+                self._zips_with_failed_uploads.add(zip_name)
                 logger.warning(f"⚠️  {failed_count} files from {zip_name} failed to upload")
                 logger.warning(f"Failed uploads saved to: {self.failed_uploads_file}")
                 # Don't delete zip file if there are failed uploads - keep it for retry
-                logger.warning(f"⚠️  Keeping zip file {zip_name} for retry of failed uploads")
+                logger.warning("⚠️  Keeping zip file %s for retry of failed uploads", zip_name)
                 # Don't mark zip as uploaded if there are failures
                 return True  # Return True but don't delete zip
             
@@ -1436,35 +1504,27 @@ class MigrationOrchestrator:
             
             # Cleanup successfully uploaded processed files (save disk space)
             # Keep failed uploads for retry
-            import shutil
-            cleaned_count = 0
-            for file_path, success in upload_results.items():
-                # Only delete processed files (not original extracted files)
-                # and only if upload was successful
-                if success and file_path.exists() and str(file_path).startswith(str(processed_dir)):
-                    try:
-                        file_path.unlink()
-                        cleaned_count += 1
-                    except Exception as e:
-                        logger.warning(f"Could not delete processed file {file_path.name}: {e}")
+            cleaned_count, cleanup_errors = unlink_files(processed_to_cleanup)
+            for file_path, error in cleanup_errors.items():
+                logger.warning(f"Could not delete processed file {file_path.name}: {error}")
             
             if cleaned_count > 0:
-                logger.info(f"✓ Cleaned up {cleaned_count} successfully uploaded processed files")
+                logger.info("✓ Cleaned up %d successfully uploaded processed files", cleaned_count)
             
             # Cleanup extracted files for this zip (save disk space)
             if extracted_dir.exists():
-                logger.info(f"Cleaning up extracted files for {zip_path.name}")
-                shutil.rmtree(extracted_dir)
-                logger.info(f"✓ Cleaned up extracted files for {zip_path.name}")
+                logger.info("Cleaning up extracted files for %s", zip_path.name)
+                remove_tree(extracted_dir)
+                logger.info("✓ Cleaned up extracted files for %s", zip_path.name)
             
-            logger.info(f"✓ Completed processing {zip_path.name}")
+            logger.info("✓ Completed processing %s", zip_path.name)
             return True
             
         except MigrationStoppedException:
             # Re-raise to stop migration
             raise
         except Exception as e:
-            logger.error(f"Failed to process {zip_name}: {e}", exc_info=True)
+            logger.error("Failed to process %s: %s", zip_name, e, exc_info=True)
             # Mark zip as failed (unknown step)
             self.state_manager.mark_zip_failed(
                 zip_name,
@@ -1472,51 +1532,48 @@ class MigrationOrchestrator:
                 str(e)
             )
             return False
+        finally:
+            self.state_manager.end_batch()
     
     def _restart_from_scratch(self):
         """
         Clean up all downloaded files, extracted files, processed files, and tracking files.
         This allows the migration to restart from scratch, re-downloading and reprocessing everything.
         """
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("Restarting from scratch - Cleaning up all files and history")
-        logger.info("=" * 60)
-        
-        import shutil
+        logger.info(_BANNER)
         
         # Clear state
         self.state_manager.clear_state()
         logger.info("  ✓ Cleared state files")
         
         # Clean up zip files
-        zip_dir = self.base_dir / self.config['processing']['zip_dir']
+        zip_dir = self._zip_dir
         if zip_dir.exists():
             zip_files = list(zip_dir.glob("*.zip"))
             if zip_files:
                 logger.info(f"Deleting {len(zip_files)} downloaded zip file(s)...")
-                for zip_file in zip_files:
-                    try:
-                        zip_file.unlink()
-                        logger.debug(f"  Deleted: {zip_file.name}")
-                    except Exception as e:
-                        logger.warning(f"  Could not delete {zip_file.name}: {e}")
+                _, delete_errors = unlink_files(zip_files)
+                for zip_file, error in delete_errors.items():
+                    logger.warning(f"  Could not delete {zip_file.name}: {error}")
         
         # Clean up extracted files
-        extracted_dir = self.base_dir / self.config['processing']['extracted_dir']
+        extracted_dir = self._extracted_dir
         if extracted_dir.exists():
             logger.info(f"Deleting extracted files directory: {extracted_dir}")
             try:
-                shutil.rmtree(extracted_dir)
+                remove_tree(extracted_dir)
                 logger.info("  ✓ Deleted extracted files")
             except Exception as e:
                 logger.warning(f"  Could not delete extracted directory: {e}")
         
         # Clean up processed files
-        processed_dir = self.base_dir / self.config['processing']['processed_dir']
+        processed_dir = self._processed_dir
         if processed_dir.exists():
             logger.info(f"Deleting processed files directory: {processed_dir}")
             try:
-                shutil.rmtree(processed_dir)
+                remove_tree(processed_dir)
                 logger.info("  ✓ Deleted processed files")
             except Exception as e:
                 logger.warning(f"  Could not delete processed directory: {e}")
@@ -1539,14 +1596,154 @@ class MigrationOrchestrator:
                 logger.warning(f"  Could not delete corrupted zips file: {e}")
         
         # Reset state flags
+        self._zips_with_failed_uploads.clear()
+        self._validated_zips.clear()
         self._skip_continue_prompts = False
         self.ignore_all_verification_failures = False
         
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("✓ Cleanup complete - Ready to restart from scratch")
-        logger.info("=" * 60)
+        logger.info(_BANNER)
         logger.info("")
     
+    def _get_current_disk_usage_gb(self) -> float:
+        """
+        Get the disk space currently used by all files under the base directory.
+        
+        Returns:
+            Disk usage in GB
+        """
+        return directory_size(self.base_dir) / (1024 ** 3)
+    
+    def _free_disk_gb(self) -> float:
+        """
+        Get the free space on the file system holding the base directory.
+        
+        Returns:
+            Free disk space in GB
+        """
+        return shutil.disk_usage(self.base_dir).free / (1024 ** 3)
+    
+    def _has_free_space_for(self, needed_gb: float) -> bool:
+        """
+        Check whether the base directory's file system has enough free space.
+        
+        If space is short while zip deletions are still pending, waits for them
+        and checks again.
+        
+        Args:
+            needed_gb: Space needed in GB
+        
+        Returns:
+            True if at least needed_gb is free
+        """
+        if self._free_disk_gb() >= needed_gb:
+            return True
+        if self._pending_zip_deletions:
+            self._wait_for_zip_deletions()
+            return self._free_disk_gb() >= needed_gb
+        return False
+    
+    @staticmethod
+    def _zip_size_gb(file_info: dict) -> float:
+        """
+        Get the size of a zip file from its Google Drive metadata.
+        
+        Args:
+            file_info: Google Drive file metadata dictionary
+        
+        Returns:
+            Size in GB (0 if the size is unknown)
+        """
+        try:
+            return int(file_info.get('size') or 0) / (1024 ** 3)
+        except (ValueError, TypeError):
+            return 0.0
+    
+    def _start_prefetch(self, file_info: dict, zip_dir: Path):
+        """
+        Start downloading a zip file in the background.
+        
+        Args:
+            file_info: Google Drive file metadata for the zip to download
+            zip_dir: Directory to save the zip file
+        """
+        logger.info(f"Downloading next zip in the background: {file_info['name']}")
+        self._next_zip_name = file_info['name']
+        self._next_zip_future = self._io_pool.submit(
+            self.downloader.download_single_zip, file_info, zip_dir
+        )
+    
+    def _take_prefetched_zip(self, zip_name: str) -> Optional[Path]:
+        """
+        Get the background download for a zip file, waiting for it to finish.
+        
+        Args:
+            zip_name: Name of the zip file
+        
+        Returns:
+            Path to the downloaded zip, or None if it was not downloaded in the background
+        
+        Raises:
+            Exception: Any error raised by the background download
+        """
+        if self._next_zip_future is None or self._next_zip_name != zip_name:
+            return None
+        future = self._next_zip_future
+        self._next_zip_future = None
+        self._next_zip_name = None
+        return future.result()
+    
+    def _wait_for_prefetch(self):
+        """Wait for any background download to finish before stopping or cleaning up."""
+        if self._next_zip_future is None:
+            return
+        logger.info(f"Waiting for background download of {self._next_zip_name} to finish...")
+        try:
+            self._next_zip_future.result()
+        except Exception as e:
+            # It will be downloaded (or validated and re-downloaded) on the next run
+            logger.warning(f"Background download of {self._next_zip_name} failed: {e}")
+        self._next_zip_future = None
+        self._next_zip_name = None
+    
+    def _delete_zip_in_background(self, zip_file: Path):
+        """
+        Delete a processed zip file without blocking the next download.
+        
+        Args:
+            zip_file: Zip file to delete
+        """
+        def delete_zip():
+            _, errors = unlink_files([zip_file])
+            if errors:
+                logger.warning("Could not delete zip file %s: %s", zip_file.name, errors[zip_file])
+            else:
+                logger.info("✓ Deleted %s", zip_file.name)
+        
+        logger.info("Deleting zip file to free up disk space: %s", zip_file.name)
+        self._pending_zip_deletions = [f for f in self._pending_zip_deletions if not f.done()]
+        self._pending_zip_deletions.append(self._io_pool.submit(delete_zip))
+    
+    def _wait_for_zip_deletions(self):
+        """Wait for background zip deletions to finish."""
+        for future in self._pending_zip_deletions:
+            future.result()
+        self._pending_zip_deletions = []
+    
+    def _wait_for_background_work(self):
+        """Wait for background downloads and deletions before stopping or cleaning up."""
+        self._wait_for_prefetch()
+        self._wait_for_zip_deletions()
+    
+    def close(self):
+        """Wait for background work to finish and shut down the background I/O pool."""
+        if self._io_pool is None:
+            return
+        self._wait_for_background_work()
+        self._io_pool.shutdown(wait=True)
+        self._io_pool = None
+    
     def _find_existing_zips(self, zip_dir: Path, zip_file_list: List[dict]) -> List[Path]:
         """
         Find zip files that are already downloaded locally.
@@ -1558,18 +1755,46 @@ class MigrationOrchestrator:
         Returns:
             List of paths to existing zip files
         """
-        existing_zips = []
         zip_dir.mkdir(parents=True, exist_ok=True)
         
         # Create a set of expected zip file names for quick lookup
         expected_names = {file_info['name'] for file_info in zip_file_list}
         
-        # Find matching zip files in the directory
-        for zip_file in zip_dir.glob("*.zip"):
-            if zip_file.name in expected_names:
-                existing_zips.append(zip_file)
+        # Find zip files present in the directory (single scandir pass, no glob matching)
+        with os.scandir(zip_dir) as entries:
+            present_names = {entry.name for entry in entries if entry.name.endswith('.zip')}
+        
+        # Sort for consistent processing order
+        return [zip_dir / name for name in sorted(present_names & expected_names)]
+    
+    def _validate_existing_zips(self, existing_zips: List[Path]) -> Dict[Path, str]:
+        """
+        Validate already-downloaded zip files in parallel.
+        
+        Valid zips are remembered so they are not validated again at extraction time.
         
-        return sorted(existing_zips)  # Sort for consistent processing order
+        Args:
+            existing_zips: Paths to zip files already present locally
+        
+        Returns:
+            Dictionary mapping each corrupted zip file to its error message
+        """
+        def validate(zip_path: Path) -> Optional[str]:
+            try:
+                self.extractor.validate_zip(zip_path)
+            except ExtractionError as e:
+                return str(e)
+            return None
+        
+        results = parallel_map_with_results(validate, existing_zips, max_workers=self._max_workers)
+        
+        corrupted = {}
+        for zip_path, error_message in results.items():
+            if error_message is None:
+                self._validated_zips.add(zip_path.name)
+            else:
+                corrupted[zip_path] = error_message
+        return corrupted
     
     def run(self, retry_failed: bool = False):
         """
@@ -1578,20 +1803,42 @@ class MigrationOrchestrator:
         Args:
             retry_failed: If True, only retry previously failed uploads
         """
-        # If retry mode, just retry failed uploads and exit
-        if retry_failed:
-            self.setup_icloud_uploader()
-            self.retry_failed_uploads()
-            return
+        # Each run gets its own pool so the orchestrator can be run again after close()
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='gpim-io')
+        try:
+            # If retry mode, just retry failed uploads and exit
+            if retry_failed:
+                self.setup_icloud_uploader()
+                self.retry_failed_uploads()
+                return
+            
+            # A restart requested at a continue prompt ends the current pass; start over
+            # here instead of calling run() recursively so restarts don't grow the stack
+            while True:
+                self._run_once()
+                if not self._restart_requested:
+                    return
+                self._restart_from_scratch()
+                self._restart_requested = False
+                logger.info("Restarting migration from scratch...")
+        finally:
+            self.close()
+    
+    def _run_once(self):
+        """
+        Run a single pass of the migration: list, download, process and upload all zip files.
         
+        Returns early with self._restart_requested set if the user asks to restart
+        from scratch; run() performs the restart.
+        """
         try:
             # Phase 1: List all zip files (without downloading yet)
-            logger.info("=" * 60)
+            logger.info(_BANNER)
             logger.info("Phase 1: Listing zip files from Google Drive")
-            logger.info("=" * 60)
+            logger.info(_BANNER)
             
             drive_config = self.config['google_drive']
-            zip_dir = self.base_dir / self.config['processing']['zip_dir']
+            zip_dir = self._zip_dir
             
             # List files without downloading
             zip_file_list = self.downloader.list_zip_files(
@@ -1603,19 +1850,53 @@ class MigrationOrchestrator:
                 logger.error("No zip files found. Exiting.")
                 return
             
+            # Create mapping from file name to file_info for looking up existing zips
+            file_info_by_name = {file_info['name']: file_info for file_info in zip_file_list}
+            
             # Check for already-downloaded zip files
             existing_zips = self._find_existing_zips(zip_dir, zip_file_list)
             
+            # Validate them up front so corrupted downloads are reported before processing starts
+            corrupted_existing = self._validate_existing_zips(existing_zips)
+            self.state_manager.begin_batch()
+            try:
+                for corrupted_zip, error_message in corrupted_existing.items():
+                    logger.error(f"❌ Corrupted zip file detected: {corrupted_zip}")
+                    logger.error(f"   Error: {error_message}")
+                    self.state_manager.mark_zip_failed(
+                        corrupted_zip.name,
+                        ZipProcessingState.FAILED_EXTRACTION,
+                        error_message
+                    )
+                    file_info = file_info_by_name.get(corrupted_zip.name) or {
+                        'id': 'unknown',
+                        'name': corrupted_zip.name,
+                        'size': str(corrupted_zip.stat().st_size)
+                    }
+                    self._save_corrupted_zip(file_info, corrupted_zip, error_message)
+                    logger.warning(f"Skipping corrupted zip file: {corrupted_zip}")
+            finally:
+                self.state_manager.end_batch()
+            if corrupted_existing:
+                existing_zips = [z for z in existing_zips if z not in corrupted_existing]
+            
             if existing_zips:
                 total_size_gb = sum(f.stat().st_size for f in existing_zips) / (1024 ** 3)
                 logger.info("")
-                logger.info("=" * 60)
+                logger.info(_BANNER)
                 logger.info(f"Found {len(existing_zips)} already-downloaded zip files ({total_size_gb:.2f} GB)")
                 logger.info("These will be processed FIRST to free up disk space")
-                logger.info("=" * 60)
+                logger.info(_BANNER)
                 logger.info("")
             
+            # Zips completed in an earlier run (looked up once from the state index)
+            completed_names = file_info_by_name.keys() & self.state_manager.get_zips_by_state(
+                ZipProcessingState.UPLOADED
+            )
+            
             logger.info(f"Found {len(zip_file_list)} zip files total to process")
+            if completed_names:
+                logger.info(f"  ({len(completed_names)} already completed in a previous run)")
             logger.info("")
             logger.info("Processing each zip file individually:")
             logger.info("  - Download → Extract → Process metadata → Upload → Cleanup")
@@ -1625,21 +1906,18 @@ class MigrationOrchestrator:
             # Setup iCloud uploader once (before processing zips)
             self.setup_icloud_uploader()
             
-            # Create mapping from file name to file_info for looking up existing zips
-            file_info_by_name = {file_info['name']: file_info for file_info in zip_file_list}
-            
             successful = 0
-            failed = 0
+            failed = len(corrupted_existing)
             total_zips = len(zip_file_list)
-            processed_count = 0
+            processed_count = len(corrupted_existing)
             
             # FIRST: Process already-downloaded zip files to free up space
             for existing_zip in existing_zips:
                 processed_count += 1
                 try:
-                    logger.info("=" * 60)
-                    logger.info(f"Processing existing zip {processed_count}/{total_zips}: {existing_zip.name}")
-                    logger.info("=" * 60)
+                    logger.info(_BANNER)
+                    logger.info("Processing existing zip %d/%d: %s", processed_count, total_zips, existing_zip.name)
+                    logger.info(_BANNER)
                     
                     # Look up file_info for this existing zip
                     file_info = file_info_by_name.get(existing_zip.name)
@@ -1648,51 +1926,34 @@ class MigrationOrchestrator:
                     process_result = self.process_single_zip(existing_zip, processed_count, total_zips, file_info=file_info)
                     
                     # Check if there are failed uploads for this zip
-                    has_failed_uploads = self.failed_uploads_file.exists() and self.failed_uploads_file.stat().st_size > 0
-                    if has_failed_uploads:
-                        try:
-                            with open(self.failed_uploads_file, 'r') as f:
-                                failed_data = json.load(f)
-                            # Check if any failed uploads are from this zip's extracted files
-                            zip_has_failures = any(
-                                str(existing_zip.name) in failed_file or 
-                                any(existing_zip.stem in failed_file for failed_file in failed_data.keys())
-                                for failed_file in failed_data.keys()
-                            )
-                            if zip_has_failures:
-                                logger.warning(f"⚠️  Keeping zip file {existing_zip.name} due to failed uploads")
-                                if process_result:
-                                    successful += 1
-                                else:
-                                    failed += 1
-                                continue  # Skip deletion
-                        except Exception:
-                            pass  # If we can't check, proceed normally
+                    if existing_zip.name in self._zips_with_failed_uploads:
+                        logger.warning("⚠️  Keeping zip file %s due to failed uploads", existing_zip.name)
+                        if process_result:
+                            successful += 1
+                        else:
+                            failed += 1
+                        continue  # Skip deletion
                     
                     if process_result:
                         successful += 1
                         
                         # Cleanup zip file after successful processing to free up space
-                        logger.info(f"Deleting zip file to free up disk space: {existing_zip.name}")
-                        existing_zip.unlink()
-                        logger.info(f"✓ Deleted {existing_zip.name}")
+                        self._delete_zip_in_background(existing_zip)
                     else:
                         failed += 1
-                        logger.warning(f"Failed to process {existing_zip.name}, keeping zip file for retry")
+                        logger.warning("Failed to process %s, keeping zip file for retry", existing_zip.name)
                     
                     # Ask user if they want to continue after each zip (unless they chose "Continue All")
                     if not self._skip_continue_prompts:
                         if not self._ask_continue_after_zip(processed_count, total_zips):
                             logger.info("Migration stopped by user after zip file processing.")
+                            self._wait_for_zip_deletions()
                             return
                         
                         # Check if restart was requested
                         if self._restart_requested:
-                            self._restart_from_scratch()
-                            self._restart_requested = False
-                            logger.info("Restarting migration from scratch...")
-                            # Recursively call run() to restart the entire process
-                            return self.run(retry_failed=False)
+                            self._wait_for_zip_deletions()
+                            return
                         
                 except CorruptedZipException as e:
                     # Corrupted zip detected
@@ -1709,6 +1970,7 @@ class MigrationOrchestrator:
                 except MigrationStoppedException as e:
                     logger.info("Migration stopped by user.")
                     logger.info(f"Reason: {e}")
+                    self._wait_for_zip_deletions()
                     return
                 except Exception as e:
                     failed += 1
@@ -1716,71 +1978,117 @@ class MigrationOrchestrator:
                     logger.warning(f"Skipping remaining processing for {existing_zip.name}")
             
             # THEN: Download and process remaining zip files
+            # Zips found locally were handled above (processed, kept for retry, or corrupted),
+            # so only the rest are candidates for download. Sizes are parsed once here
+            # as (file_info, size in GB) pairs for the disk space checks.
+            handled_names = {existing_zip.name for existing_zip in existing_zips}
+            handled_names.update(corrupted_zip.name for corrupted_zip in corrupted_existing)
+            zips_to_download = []
             for file_info in zip_file_list:
-                zip_file_path = zip_dir / file_info['name']
-                
-                # Skip if we already processed this file (or it failed)
-                if zip_file_path.exists():
+                if file_info['name'] in handled_names:
                     continue
-                
+                # Zips completed in an earlier run don't need to be downloaded again
+                if file_info['name'] in completed_names:
+                    processed_count += 1
+                    successful += 1
+                    logger.info("⏭️  Skipping %s - already fully processed", file_info['name'])
+                    continue
+                zips_to_download.append((file_info, self._zip_size_gb(file_info)))
+            
+            # Disk space limit (None or 0 = unlimited). Usage is measured once and then only
+            # re-measured after a zip that left files behind, not walked again for every zip.
+            max_disk_space_gb = self._max_disk_space_gb
+            disk_usage_gb = None
+            
+            for index, (file_info, zip_size_gb) in enumerate(zips_to_download):
                 processed_count += 1
+                # Room is needed for the zip plus its extracted and processed copies
+                needed_gb = zip_size_gb * ZIP_WORKING_SPACE_FACTOR
+                
+                # Free space on the file system (one statvfs call). A zip already being
+                # downloaded in the background only needs room for its working copies.
+                needed_free_gb = needed_gb - zip_size_gb if self._next_zip_name == file_info['name'] else needed_gb
+                if not self._has_free_space_for(needed_free_gb):
+                    logger.warning(_BANNER)
+                    logger.warning(f"⚠️  Not enough free disk space for {file_info['name']}")
+                    logger.warning(f"   Free: {self._free_disk_gb():.2f} GB, needs about {needed_free_gb:.2f} GB")
+                    logger.warning(f"   Stopping downloads; {len(zips_to_download) - index} zip file(s) not downloaded")
+                    logger.warning("   Free up disk space, then run again")
+                    logger.warning(_BANNER)
+                    break
+                
+                if max_disk_space_gb:
+                    if disk_usage_gb is None:
+                        # Measure only once pending zip deletions have freed their space
+                        self._wait_for_zip_deletions()
+                        disk_usage_gb = self._get_current_disk_usage_gb()
+                    if disk_usage_gb + needed_gb > max_disk_space_gb:
+                        logger.warning(_BANNER)
+                        logger.warning(f"⚠️  Disk space limit reached ({max_disk_space_gb} GB)")
+                        logger.warning(f"   Current usage: {disk_usage_gb:.2f} GB, "
+                                       f"{file_info['name']} needs about {needed_gb:.2f} GB")
+                        logger.warning(f"   Stopping downloads; {len(zips_to_download) - index} zip file(s) not downloaded")
+                        logger.warning("   Free up disk space or raise processing.max_disk_space_gb, then run again")
+                        logger.warning(_BANNER)
+                        break
+                # Usage is only known again once this zip has been fully cleaned up
+                usage_before_zip_gb, disk_usage_gb = disk_usage_gb, None
+                
                 try:
                     # Download this zip file
-                    logger.info("=" * 60)
-                    logger.info(f"Downloading zip {processed_count}/{total_zips}: {file_info['name']}")
-                    logger.info("=" * 60)
+                    logger.info(_BANNER)
+                    logger.info("Downloading zip %d/%d: %s", processed_count, total_zips, file_info['name'])
+                    logger.info(_BANNER)
+                    
+                    zip_file = self._take_prefetched_zip(file_info['name'])
+                    if zip_file is None:
+                        zip_file = self.downloader.download_single_zip(file_info, zip_dir)
                     
-                    zip_file = self.downloader.download_single_zip(file_info, zip_dir)
+                    # Download the next zip in the background while this one is processed,
+                    # as long as it fits next to this zip's working copies and within the limit
+                    if index + 1 < len(zips_to_download):
+                        next_file_info, next_size_gb = zips_to_download[index + 1]
+                        next_needed_gb = next_size_gb * ZIP_WORKING_SPACE_FACTOR
+                        if (self._free_disk_gb() >= needed_gb - zip_size_gb + next_size_gb and
+                                (not max_disk_space_gb or
+                                 usage_before_zip_gb + needed_gb + next_needed_gb <= max_disk_space_gb)):
+                            self._start_prefetch(next_file_info, zip_dir)
                     
                     # Process this zip file (file_info is already available)
                     process_result = self.process_single_zip(zip_file, processed_count, total_zips, file_info=file_info)
                     
                     # Check if there are failed uploads for this zip
-                    has_failed_uploads = self.failed_uploads_file.exists() and self.failed_uploads_file.stat().st_size > 0
-                    if has_failed_uploads:
-                        try:
-                            with open(self.failed_uploads_file, 'r') as f:
-                                failed_data = json.load(f)
-                            # Check if any failed uploads are from this zip's extracted files
-                            zip_has_failures = any(
-                                str(zip_file.name) in failed_file or 
-                                any(zip_file.stem in failed_file for failed_file in failed_data.keys())
-                                for failed_file in failed_data.keys()
-                            )
-                            if zip_has_failures:
-                                logger.warning(f"⚠️  Keeping zip file {zip_file.name} due to failed uploads")
-                                if process_result:
-                                    successful += 1
-                                else:
-                                    failed += 1
-                                continue  # Skip deletion
-                        except Exception:
-                            pass  # If we can't check, proceed normally
+                    if zip_file.name in self._zips_with_failed_uploads:
+                        logger.warning("⚠️  Keeping zip file %s due to failed uploads", zip_file.name)
+                        if process_result:
+                            successful += 1
+                        else:
+                            failed += 1
+                        continue  # Skip deletion
                     
                     if process_result:
                         successful += 1
                         
                         # Cleanup zip file after successful processing to free up space
-                        logger.info(f"Deleting zip file to free up disk space: {zip_file.name}")
-                        zip_file.unlink()
-                        logger.info(f"✓ Deleted {zip_file.name}")
+                        self._delete_zip_in_background(zip_file)
+                        # Zip, extracted and processed files are all gone again (counted as soon
+                        # as the zip deletion is queued)
+                        disk_usage_gb = usage_before_zip_gb
                     else:
                         failed += 1
-                        logger.warning(f"Failed to process {zip_file.name}, keeping zip file for retry")
+                        logger.warning("Failed to process %s, keeping zip file for retry", zip_file.name)
                     
                     # Ask user if they want to continue after each zip (unless they chose "Continue All")
                     if not self._skip_continue_prompts:
                         if not self._ask_continue_after_zip(processed_count, total_zips):
                             logger.info("Migration stopped by user after zip file processing.")
+                            self._wait_for_background_work()
                             return
                         
                         # Check if restart was requested
                         if self._restart_requested:
-                            self._restart_from_scratch()
-                            self._restart_requested = False
-                            logger.info("Restarting migration from scratch...")
-                            # Recursively call run() to restart the entire process
-                            return self.run(retry_failed=False)
+                            self._wait_for_background_work()
+                            return
                         
                 except CorruptedZipException as e:
                     # Corrupted zip detected
@@ -1797,12 +2105,16 @@ class MigrationOrchestrator:
                 except MigrationStoppedException as e:
                     logger.info("Migration stopped by user.")
                     logger.info(f"Reason: {e}")
+                    self._wait_for_background_work()
                     return
                 except Exception as e:
                     failed += 1
                     logger.error(f"Error processing {file_info.get('name', 'unknown')}: {e}", exc_info=True)
                     logger.warning(f"Skipping remaining processing for {file_info.get('name', 'unknown')}")
             
+            # Zip deletions (and a download, if the disk space limit was reached) may still be running
+            self._wait_for_background_work()
+            
             # Check for failed uploads before final cleanup
             failed_uploads_exist = self.failed_uploads_file.exists() and self.failed_uploads_file.stat().st_size > 0
             
@@ -1811,9 +2123,9 @@ class MigrationOrchestrator:
                 self._paused_for_retries = True
                 
                 logger.info("")
-                logger.warning("=" * 60)
+                logger.warning(_BANNER)
                 logger.warning("⚠️  FAILED UPLOADS DETECTED")
-                logger.warning("=" * 60)
+                logger.warning(_BANNER)
                 logger.warning("Some files failed to upload. The downloaded zip files have been kept")
                 logger.warning("so you can retry the failed uploads.")
                 logger.warning("")
@@ -1821,7 +2133,7 @@ class MigrationOrchestrator:
                 logger.warning("  python main.py --config <config> --retry-failed")
                 logger.warning("")
                 logger.warning("After retrying, you can proceed with cleanup.")
-                logger.warning("=" * 60)
+                logger.warning(_BANNER)
                 
                 # Wait for user to proceed
                 proceed = self._ask_proceed_after_retries()
@@ -1840,7 +2152,7 @@ class MigrationOrchestrator:
             # Check for corrupted zips
             corrupted_zips_exist = self.corrupted_zips_file.exists() and self.corrupted_zips_file.stat().st_size > 0
             
-            logger.info("=" * 60)
+            logger.info(_BANNER)
             logger.info(f"Migration completed!")
             logger.info(f"  Successful: {successful}/{len(zip_file_list)} zip files")
             if failed > 0:
@@ -1848,12 +2160,11 @@ class MigrationOrchestrator:
             
             if corrupted_zips_exist:
                 logger.info("")
-                logger.warning("=" * 60)
+                logger.warning(_BANNER)
                 logger.warning("⚠️  CORRUPTED ZIP FILES DETECTED")
-                logger.warning("=" * 60)
+                logger.warning(_BANNER)
                 try:
-                    with open(self.corrupted_zips_file, 'r') as f:
-                        corrupted_data = json.load(f)
+                    corrupted_data = read_json(self.corrupted_zips_file)
                     corrupted_count = len(corrupted_data)
                     logger.warning(f"Found {corrupted_count} corrupted zip file(s)")
                     logger.warning(f"Corrupted zip files saved to: {self.corrupted_zips_file}")
@@ -1872,7 +2183,7 @@ class MigrationOrchestrator:
                     logger.warning("")
                     logger.warning("You can manually re-download these files from Google Drive")
                     logger.warning("or delete the corrupted local files and re-run the script")
-                    logger.warning("=" * 60)
+                    logger.warning(_BANNER)
                 except (json.JSONDecodeError, IOError) as e:
                     logger.warning(f"Could not read corrupted zips file: {e}")
             
@@ -1882,7 +2193,7 @@ class MigrationOrchestrator:
                 logger.warning(f"Failed uploads saved to: {self.failed_uploads_file}")
                 logger.warning("To retry failed uploads, run:")
                 logger.warning(f"  python main.py --config {self.config_path} --retry-failed")
-            logger.info("=" * 60)
+            logger.info(_BANNER)
             
         except Exception as e:
             logger.error(f"Migration failed: {e}", exc_info=True)
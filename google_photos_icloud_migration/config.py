@@ -29,6 +29,12 @@ import os
 import jsonschema
 import logging
 
+# Use libyaml's C loader and dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlSafeLoader, CSafeDumper as YamlSafeDumper
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader, SafeDumper as YamlSafeDumper
+
 logger = logging.getLogger(__name__)
 
 
@@ -183,6 +189,12 @@ class ProcessingConfig:
         enable_parallel_processing: Enable/disable parallel processing entirely (default: True).
                                    If False, all operations run sequentially.
                                    Set to False for debugging or resource-constrained environments.
+        max_disk_space_gb: Maximum disk space to use under base_dir, in GB (default: None = unlimited).
+                          0 also means unlimited. New zip files are not downloaded once the
+                          estimated usage (zip plus extracted and processed copies) would exceed it.
+        deep_zip_validation: If True, verify the CRC of every zip entry before extraction (default: False).
+                            This decompresses each archive an extra time; by default only the
+                            zip structure is checked and corrupt entries surface during extraction.
     
     Properties:
         base_path: Returns base_dir as Path object for convenient path operations.
@@ -191,7 +203,8 @@ class ProcessingConfig:
         processed_path: Returns full path to processed directory (base_dir/processed_dir).
     
     Raises:
-        ValueError: If base_dir is empty or batch_size is less than 1.
+        ValueError: If base_dir is empty, batch_size is less than 1,
+                   or max_disk_space_gb is negative.
     """
     base_dir: str
     zip_dir: str = "zips"
@@ -201,18 +214,23 @@ class ProcessingConfig:
     cleanup_after_upload: bool = True
     max_workers: Optional[int] = None  # None = auto-detect (recommended)
     enable_parallel_processing: bool = True
+    max_disk_space_gb: Optional[float] = None  # None or 0 = unlimited
+    deep_zip_validation: bool = False
     
     def __post_init__(self):
         """
         Validate processing configuration after initialization.
         
         Raises:
-            ValueError: If base_dir is empty or batch_size is less than 1.
+            ValueError: If base_dir is empty, batch_size is less than 1,
+                       or max_disk_space_gb is negative.
         """
         if not self.base_dir:
             raise ValueError("base_dir is required")
         if self.batch_size < 1:
             raise ValueError("batch_size must be at least 1")
+        if self.max_disk_space_gb is not None and self.max_disk_space_gb < 0:
+            raise ValueError("max_disk_space_gb cannot be negative")
     
     @property
     def base_path(self) -> Path:
@@ -381,13 +399,34 @@ class MigrationConfig:
         # Load YAML
         try:
             with open(config_path, 'r') as f:
-                config_dict = yaml.safe_load(f)
+                config_dict = yaml.load(f, Loader=YamlSafeLoader)
         except (yaml.YAMLError, IOError, OSError) as e:
             raise ValueError(f"Failed to load configuration file '{config_path}': {e}") from e
         
         if config_dict is None:
             raise ValueError(f"Configuration file '{config_path}' is empty or invalid")
         
+        return cls.from_mapping(config_dict, validate=validate)
+    
+    @classmethod
+    def from_mapping(cls, config_dict: Dict[str, Any], validate: bool = True) -> 'MigrationConfig':
+        """
+        Load configuration from an already-parsed dictionary.
+        
+        Performs the same schema validation and environment variable overrides as
+        from_yaml(), without reading or parsing a file. Useful when the configuration
+        is built in memory (e.g. in tests).
+        
+        Args:
+            config_dict: Configuration dictionary with the same structure as the YAML file
+            validate: Whether to validate configuration against JSON schema (default: True)
+        
+        Returns:
+            MigrationConfig instance with all sub-configurations loaded and validated.
+        
+        Raises:
+            ValueError: If the configuration fails validation.
+        """
         # Validate schema if requested
         if validate:
             cls._validate_schema(config_dict)
@@ -424,7 +463,7 @@ class MigrationConfig:
         
         Note:
             Missing sections use default values. This method is called internally by
-            from_yaml() after YAML loading and environment variable overrides.
+            from_mapping() after validation and environment variable overrides.
         
         Example:
             >>> config_dict = {
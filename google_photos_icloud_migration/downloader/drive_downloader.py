@@ -13,7 +13,6 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.errors import HttpError
-import io
 import logging
 
 from google_photos_icloud_migration.exceptions import DownloadError, AuthenticationError
@@ -23,6 +22,9 @@ logger = logging.getLogger(__name__)
 # Scopes required for Google Drive API
 SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
 
+# Write buffer for downloaded files, so data is written to disk in large units
+DOWNLOAD_WRITE_BUFFER_BYTES = 8 * 1024 * 1024
+
 
 class DriveDownloader:
     """
@@ -350,7 +352,8 @@ class DriveDownloader:
         return True
     
     def download_file(self, file_id: str, file_name: str, 
-                     destination_dir: Path, file_size: Optional[int] = None) -> Path:
+                     destination_dir: Path, file_size: Optional[int] = None,
+                     write_buffer_bytes: int = DOWNLOAD_WRITE_BUFFER_BYTES) -> Path:
         """
         Download a file from Google Drive with retry logic and progress tracking.
         
@@ -369,6 +372,8 @@ class DriveDownloader:
             file_size: Optional file size in bytes for disk space checking.
                      If provided, checks available disk space before downloading.
                      If None, skips disk space check (not recommended for large files).
+            write_buffer_bytes: Size of the buffer the file is written through
+                              (default: DOWNLOAD_WRITE_BUFFER_BYTES)
         
         Returns:
             Path object pointing to the downloaded file.
@@ -410,14 +415,15 @@ class DriveDownloader:
         for attempt in range(max_retries):
             try:
                 request = self.service.files().get_media(fileId=file_id)
-                fh = io.FileIO(destination_path, 'wb')
-                downloader = MediaIoBaseDownload(fh, request)
-                
-                done = False
-                while done is False:
-                    status, done = downloader.next_chunk()
-                    if status:
-                        logger.debug(f"Download progress: {int(status.progress() * 100)}%")
+                # Closed (and flushed) before the file is measured or extracted
+                with open(destination_path, 'wb', buffering=write_buffer_bytes) as fh:
+                    downloader = MediaIoBaseDownload(fh, request)
+                    
+                    done = False
+                    while done is False:
+                        status, done = downloader.next_chunk()
+                        if status:
+                            logger.debug(f"Download progress: {int(status.progress() * 100)}%")
                 
                 logger.info(f"Downloaded {file_name} ({destination_path.stat().st_size / 1024 / 1024:.2f} MB)")
                 return destination_path
@@ -502,13 +508,16 @@ class DriveDownloader:
         logger.info(f"Downloaded {len(downloaded_files)} zip files")
         return downloaded_files
     
-    def download_single_zip(self, file_info: dict, destination_dir: Path) -> Path:
+    def download_single_zip(self, file_info: dict, destination_dir: Path,
+                            write_buffer_bytes: int = DOWNLOAD_WRITE_BUFFER_BYTES) -> Path:
         """
         Download a single zip file.
         
         Args:
             file_info: File metadata dictionary with 'id', 'name', and optionally 'size'
             destination_dir: Directory to save zip file
+            write_buffer_bytes: Size of the buffer the file is written through
+                              (default: DOWNLOAD_WRITE_BUFFER_BYTES)
         
         Returns:
             Path to downloaded file
@@ -524,6 +533,7 @@ class DriveDownloader:
             file_info['id'],
             file_info['name'],
             destination_dir,
-            file_size=file_size
+            file_size=file_size,
+            write_buffer_bytes=write_buffer_bytes
         )
 
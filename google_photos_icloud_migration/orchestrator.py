@@ -5,8 +5,9 @@ import json
 import logging
 import os
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 import yaml
 from tqdm import tqdm
 
@@ -19,7 +20,6 @@ from google_photos_icloud_migration.config import MigrationConfig
 from google_photos_icloud_migration.exceptions import ExtractionError
 from google_photos_icloud_migration.utils.state_manager import StateManager, ZipProcessingState
 from google_photos_icloud_migration.reporting.migration_statistics import MigrationStatistics
-from google_photos_icloud_migration.reporting.report_generator import ReportGenerator
 
 logger = logging.getLogger(__name__)
 
@@ -27,15 +27,20 @@ logger = logging.getLogger(__name__)
 class MigrationOrchestrator:
     """Orchestrates the entire migration process."""
     
-    def __init__(self, config_path: str):
+    def __init__(self, config: Union[str, Dict[str, Any]]):
         """
         Initialize the orchestrator.
         
         Args:
-            config_path: Path to the configuration file
+            config: Path to the configuration file, or an already-loaded
+                   configuration dictionary (config_path is then None)
         """
-        self.config_path = config_path
-        self.config = MigrationConfig.from_yaml(config_path)
+        if isinstance(config, dict):
+            self.config_path = None
+            self.config = MigrationConfig.from_mapping(config)
+        else:
+            self.config_path = config
+            self.config = MigrationConfig.from_yaml(config)
         self.base_dir = self.config.processing.base_path
         
         # Ensure directories exist
@@ -44,19 +49,25 @@ class MigrationOrchestrator:
         self.config.processing.processed_path.mkdir(parents=True, exist_ok=True)
         
         # Initialize components
-        self.downloader = DriveDownloader(
-            credentials_file=self.config.google_drive.credentials_file,
-            download_dir=self.config.processing.zip_path,
-            max_retries=self.config.google_drive.max_retries,
-            chunk_size_mb=self.config.google_drive.chunk_size_mb
-        )
+        self.downloader = DriveDownloader(self.config.google_drive.credentials_file)
         
-        self.extractor = Extractor(self.base_dir)
-        self.metadata_merger = MetadataMerger(self.base_dir)
-        self.album_parser = AlbumParser(self.base_dir)
+        self.extractor = Extractor(
+            self.base_dir,
+            deep_validation=self.config.processing.deep_zip_validation
+        )
+        self.metadata_merger = MetadataMerger(
+            preserve_dates=self.config.metadata.preserve_dates,
+            preserve_gps=self.config.metadata.preserve_gps,
+            preserve_descriptions=self.config.metadata.preserve_descriptions,
+            enable_parallel=self.config.processing.enable_parallel_processing,
+            max_workers=self.config.processing.max_workers
+        )
+        self.album_parser = AlbumParser()
         
         self.uploader = iCloudPhotosSyncUploader(
-            upload_tracking_file=self.config.icloud.upload_tracking_file
+            photos_library_path=(Path(self.config.icloud.photos_library_path).expanduser()
+                                 if self.config.icloud.photos_library_path else None),
+            upload_tracking_file=self.base_dir / 'uploaded_files.json'
         )
             
         self.statistics = MigrationStatistics()
@@ -409,6 +420,9 @@ class MigrationOrchestrator:
             
     def _generate_final_report(self, successful: int = 0, total_zips: int = 0):
         """Generate and save the final migration report."""
+        # Imported here so runs that exit before reporting don't pay for it
+        from google_photos_icloud_migration.reporting.report_generator import ReportGenerator
+        
         self.statistics.finish()
         
         logger.info("")
@@ -424,10 +438,13 @@ class MigrationOrchestrator:
             corrupted_zips_file=self.corrupted_zips_file
         )
         
-        report_path = report_generator.save_report()
-        logger.info(f"✓ Migration report saved to: {report_path.absolute()}")
-        
-        # Save statistics
+        # The report and the statistics go to separate files, so write them concurrently
         stats_path = self.base_dir / 'migration_statistics.json'
-        self.statistics.save(stats_path)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            report_future = executor.submit(report_generator.save_report)
+            stats_future = executor.submit(self.statistics.save, stats_path)
+            report_path = report_future.result()
+            stats_future.result()
+        
+        logger.info(f"✓ Migration report saved to: {report_path.absolute()}")
         logger.info(f"✓ Statistics saved to: {stats_path.absolute()}")
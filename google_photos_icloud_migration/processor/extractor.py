@@ -7,9 +7,12 @@ This module handles extraction of Google Takeout zip files with support for:
 - Path validation to prevent security vulnerabilities
 - Comprehensive error handling and recovery
 """
+import os
 import zipfile
+import zlib
 import logging
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple, Set, Optional, Iterator
 from tqdm import tqdm
@@ -26,18 +29,23 @@ MEDIA_EXTENSIONS = {'.jpg', '.jpeg', '.heic', '.png', '.gif', '.bmp', '.tiff',
 class Extractor:
     """Handles extraction of zip files and identification of media files."""
     
-    def __init__(self, base_dir: Path):
+    def __init__(self, base_dir: Path, deep_validation: bool = False):
         """
         Initialize the extractor.
         
         Args:
             base_dir: Base directory for extraction
+            deep_validation: If True, decompress every entry with ZipFile.testzip()
+                            to verify CRCs before extracting (slow for large zips).
+                            If False (default), only the zip structure is checked.
         """
         self.base_dir = base_dir
+        self.deep_validation = deep_validation
         self.extracted_dir = base_dir / "extracted"
         self.extracted_dir.mkdir(parents=True, exist_ok=True)
     
-    def extract_zip(self, zip_path: Path, extract_to: Optional[Path] = None) -> Path:
+    def extract_zip(self, zip_path: Path, extract_to: Optional[Path] = None,
+                    validate: bool = True) -> Path:
         """
         Extract a zip file maintaining directory structure with secure path handling.
         
@@ -52,6 +60,8 @@ class Extractor:
             extract_to: Optional destination directory.
                        If None, uses extracted_dir/<zip_stem> as destination.
                        Should be an absolute path for security.
+            validate: If True (default), validate the zip file before extracting.
+                     Pass False when validate_zip() has already been called for it.
         
         Returns:
             Path to the extracted directory containing all files
@@ -72,115 +82,298 @@ class Extractor:
         extract_to = extract_to.resolve()
         extract_to.mkdir(parents=True, exist_ok=True)
         
-        # Validate zip file before extraction (basic validation - check if we can open it)
+        logger.info(f"Extracting {zip_path.name} to {extract_to}")
+        
+        # The zip is opened once; validation reuses the parsed central directory
+        with self._open_zip(zip_path) as zip_ref:
+            if validate:
+                self._validate_open_zip(zip_ref, zip_path)
+            
+            # Extract with progress bar and path validation (prevent zip slip and symlink attacks)
+            entries = self._entries_to_extract(zip_ref, extract_to)
+            for zip_info in tqdm(entries, desc=f"Extracting {zip_path.name}"):
+                extracted_item = zip_ref.extract(zip_info, extract_to)
+                self._set_entry_permissions(zip_info, extracted_item)
+        
+        self._set_extraction_root_permissions(extract_to)
+        
+        logger.info(f"Extracted {zip_path.name}")
+        return extract_to
+    
+    def extract_zip_parallel(self, zip_path: Path, extract_to: Optional[Path] = None,
+                             validate: bool = True,
+                             max_workers: Optional[int] = None) -> Path:
+        """
+        Extract a zip file using several threads.
+        
+        Decompressing many entries is CPU-bound, and zlib releases the GIL, so
+        entries are spread over worker threads. Each worker opens its own ZipFile
+        handle on the archive (a single ZipFile must not be read from several
+        threads). Entries are assigned to workers by compressed size so every
+        worker gets a similar amount of data, and all directories are created up
+        front. The same path and symlink checks as extract_zip() apply.
+        
+        Args:
+            zip_path: Path to zip file to extract
+            extract_to: Optional destination directory.
+                       If None, uses extracted_dir/<zip_stem> as destination.
+            validate: If True (default), validate the zip file before extracting.
+            max_workers: Maximum number of extraction threads (default: CPU count)
+        
+        Returns:
+            Path to the extracted directory containing all files
+        
+        Raises:
+            ExtractionError: If the zip file is invalid, corrupted, or extraction fails
+                            due to path validation issues or I/O errors
+        """
+        if extract_to is None:
+            extract_to = self.extracted_dir / zip_path.stem
+        
+        extract_to = extract_to.resolve()
+        extract_to.mkdir(parents=True, exist_ok=True)
+        
+        # Validation and planning share one handle; workers open their own below
+        with self._open_zip(zip_path) as zip_ref:
+            if validate:
+                self._validate_open_zip(zip_ref, zip_path)
+            entries = self._entries_to_extract(zip_ref, extract_to)
+        
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = max(1, min(max_workers, len(entries)))
+        
+        logger.info(f"Extracting {zip_path.name} to {extract_to} using {max_workers} threads")
+        
+        # Create every directory first so workers never race to create the same parent
+        directories = {extract_to}
+        for zip_info in entries:
+            target = extract_to / zip_info.filename
+            directories.add(target if zip_info.is_dir() else target.parent)
+        for directory in sorted(directories):
+            directory.mkdir(parents=True, exist_ok=True)
+        
+        # Assign the largest entries first, each to the worker with the least data so far
+        workloads = [[] for _ in range(max_workers)]
+        workload_sizes = [0] * max_workers
+        for zip_info in sorted(entries, key=lambda info: info.compress_size, reverse=True):
+            index = workload_sizes.index(min(workload_sizes))
+            workloads[index].append(zip_info)
+            workload_sizes[index] += zip_info.compress_size
+        
+        with tqdm(total=len(entries), desc=f"Extracting {zip_path.name}") as progress:
+            def extract_entries(workload: List[zipfile.ZipInfo]) -> None:
+                with zipfile.ZipFile(zip_path, 'r') as worker_zip:
+                    for zip_info in workload:
+                        extracted_item = worker_zip.extract(zip_info, extract_to)
+                        self._set_entry_permissions(zip_info, extracted_item)
+                        progress.update(1)
+            
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for future in [executor.submit(extract_entries, w) for w in workloads if w]:
+                        future.result()
+            except (OSError, zipfile.BadZipFile, zlib.error) as e:
+                raise ExtractionError(f"Error extracting '{zip_path.name}': {e}") from e
+        
+        self._set_extraction_root_permissions(extract_to)
+        
+        logger.info(f"Extracted {zip_path.name}")
+        return extract_to
+    
+    def _entries_to_extract(self, zip_ref: zipfile.ZipFile,
+                            extract_to: Path) -> List[zipfile.ZipInfo]:
+        """
+        Check the paths of all entries and return the ones to extract.
+        
+        Args:
+            zip_ref: Open zip file
+            extract_to: Resolved extraction directory
+        
+        Returns:
+            Entries to extract (symlinks are skipped)
+        
+        Raises:
+            ExtractionError: If an entry would be written outside extract_to (zip slip)
+        """
+        entries = []
+        for zip_info in zip_ref.infolist():
+            file_info = zip_info.filename
+            
+            # Skip symlinks in zip files (security: prevent symlink attacks)
+            # Linux/Unix symlinks in zip have mode 0o120000 in the high bits of external_attr
+            if (zip_info.external_attr >> 28) == 0o12:  # S_IFLNK (symlink)
+                logger.warning(f"Skipping symlink in zip file: {file_info} (security: symlink attacks)")
+                continue
+            
+            # Validate path to prevent zip slip attack
+            target_path = (extract_to / file_info).resolve()
+            try:
+                target_path.relative_to(extract_to)
+            except ValueError:
+                raise ExtractionError(
+                    f"Invalid path in zip file (potential zip slip attack): {file_info}. "
+                    f"Path resolves outside extraction directory: {target_path}"
+                )
+            entries.append(zip_info)
+        return entries
+    
+    @staticmethod
+    def _set_entry_permissions(zip_info: zipfile.ZipInfo, extracted_item: str) -> None:
+        """
+        Set secure permissions on an extracted entry.
+        
+        Files get 0600 (owner read/write) and directories 0700 (owner access).
+        The entry type comes from the ZipInfo, so no stat calls are needed.
+        """
         try:
-            with zipfile.ZipFile(zip_path, 'r') as test_zip:
-                # Basic validation: try to list entries
-                entry_count = len(test_zip.namelist())
-                logger.debug(f"Zip file {zip_path.name} has {entry_count} entries")
-                
-                # Try full validation, but be lenient with file system errors on external drives
-                try:
-                    bad_file = test_zip.testzip()
-                    if bad_file:
-                        logger.warning(
-                            f"Zip file '{zip_path.name}' has corrupted entries (first bad file: {bad_file}), "
-                            f"but will attempt extraction anyway"
-                        )
-                except OSError as e:
-                    # File system errors (like [Errno 22]) might be external drive issues
-                    # Log warning but proceed with extraction - actual extraction may work
-                    if e.errno == 22:  # Invalid argument
-                        logger.warning(
-                            f"Zip validation hit file system error for '{zip_path.name}': {e}. "
-                            f"This may be due to external drive issues. Will attempt extraction anyway. "
-                            f"File size: {zip_path.stat().st_size / (1024*1024):.1f} MB"
-                        )
-                    else:
-                        # For other OSErrors during testzip, also just warn (extraction might still work)
-                        logger.warning(
-                            f"Zip validation error for '{zip_path.name}': {e}. "
-                            f"Will attempt extraction anyway."
-                        )
-                except Exception as e:
-                    # Other exceptions during testzip - warn but continue
-                    logger.warning(
-                        f"Zip validation error for '{zip_path.name}': {e}. "
-                        f"Will attempt extraction anyway."
-                    )
-        except zipfile.BadZipFile as e:
-            raise ExtractionError(
+            os.chmod(extracted_item, 0o700 if zip_info.is_dir() else 0o600)
+        except OSError as e:
+            # Permission setting may fail on some systems, log but don't fail
+            logger.debug(f"Could not set permissions for {extracted_item}: {e}")
+    
+    @staticmethod
+    def _set_extraction_root_permissions(extract_to: Path) -> None:
+        """Restrict the extraction root directory to the owner."""
+        try:
+            extract_to.chmod(0o700)  # Owner access only
+        except (OSError, PermissionError) as e:
+            logger.debug(f"Could not set permissions for extraction directory {extract_to}: {e}")
+    
+    def validate_zip(self, zip_path: Path) -> None:
+        """
+        Validate a zip file without extracting it.
+        
+        Opening the zip parses the central directory, and every entry is checked to
+        lie within the file. If deep validation is enabled, the CRC of every entry
+        is verified as well.
+        
+        Args:
+            zip_path: Path to zip file to validate
+        
+        Raises:
+            ExtractionError: If the zip file is invalid, truncated, or cannot be read
+        """
+        with self._open_zip(zip_path) as zip_ref:
+            self._validate_open_zip(zip_ref, zip_path)
+    
+    def _open_zip(self, zip_path: Path) -> zipfile.ZipFile:
+        """
+        Open a zip file for reading.
+        
+        Raises:
+            ExtractionError: If the file is not a valid zip file or cannot be read
+        """
+        try:
+            return zipfile.ZipFile(zip_path, 'r')
+        except Exception as e:
+            raise self._validation_error(zip_path, e) from e
+    
+    def _validate_open_zip(self, zip_ref: zipfile.ZipFile, zip_path: Path) -> None:
+        """
+        Validate an open zip file (see validate_zip()).
+        
+        Raises:
+            ExtractionError: If the zip file is invalid, truncated, or cannot be read
+        """
+        try:
+            self._validate_zip_structure(zip_ref, zip_path)
+            
+            # Full CRC validation decompresses every entry, so it is opt-in
+            if self.deep_validation:
+                self._validate_zip_contents(zip_ref, zip_path)
+        except ExtractionError:
+            raise
+        except Exception as e:
+            raise self._validation_error(zip_path, e) from e
+    
+    @staticmethod
+    def _validation_error(zip_path: Path, error: Exception) -> ExtractionError:
+        """Build the ExtractionError reported for a zip file that cannot be opened or read."""
+        if isinstance(error, zipfile.BadZipFile):
+            return ExtractionError(
                 f"File '{zip_path.name}' is not a valid zip file. "
                 f"It may be corrupted or incomplete. File size: {zip_path.stat().st_size / (1024*1024):.1f} MB. "
                 f"Consider re-downloading this file from Google Drive."
-            ) from e
-        except (OSError, IOError) as e:
+            )
+        if isinstance(error, OSError):
             # If we can't even open the zip file, that's a real problem
-            raise ExtractionError(
-                f"Error accessing zip file '{zip_path.name}': {e}. "
+            return ExtractionError(
+                f"Error accessing zip file '{zip_path.name}': {error}. "
                 f"File may be corrupted, incomplete, or inaccessible."
-            ) from e
-        except Exception as e:
+            )
+        return ExtractionError(
+            f"Unexpected error validating zip file '{zip_path.name}': {error}"
+        )
+    
+    def _validate_zip_structure(self, zip_ref: zipfile.ZipFile, zip_path: Path) -> None:
+        """
+        Check that every entry's data lies within the zip file.
+        
+        Opening the zip already validates the end-of-central-directory record;
+        this additionally catches archives whose entries point past the end of
+        the file (e.g. incomplete downloads) without decompressing anything.
+        
+        Args:
+            zip_ref: Open zip file
+            zip_path: Path to the zip file (for size and error messages)
+        
+        Raises:
+            ExtractionError: If an entry extends beyond the end of the file
+        """
+        entries = zip_ref.infolist()
+        logger.debug(f"Zip file {zip_path.name} has {len(entries)} entries")
+        if not entries:
+            return
+        
+        file_size = zip_path.stat().st_size
+        last_entry = max(entries, key=lambda info: info.header_offset)
+        if last_entry.header_offset + last_entry.compress_size > file_size:
             raise ExtractionError(
-                f"Unexpected error validating zip file '{zip_path.name}': {e}"
-            ) from e
+                f"Zip file '{zip_path.name}' is truncated: entry '{last_entry.filename}' "
+                f"extends beyond the end of the file. File size: {file_size / (1024*1024):.1f} MB. "
+                f"Consider re-downloading this file from Google Drive."
+            )
+    
+    def _validate_zip_contents(self, zip_ref: zipfile.ZipFile, zip_path: Path) -> None:
+        """
+        Verify the CRC of every entry using ZipFile.testzip().
         
-        logger.info(f"Extracting {zip_path.name} to {extract_to}")
+        Validation problems are logged as warnings; extraction is still attempted
+        since individual entries may extract correctly.
         
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            # Get list of files to extract
-            file_list = zip_ref.namelist()
-            
-            # Extract with progress bar and path validation (prevent zip slip and symlink attacks)
-            extract_to_resolved = extract_to.resolve()
-            for file_info in tqdm(file_list, desc=f"Extracting {zip_path.name}"):
-                # Skip symlinks in zip files (security: prevent symlink attacks)
-                # Check if this entry is a symlink by examining ZipInfo
-                try:
-                    zip_info = zip_ref.getinfo(file_info)
-                    # Check if this is a symlink (Linux/Unix symlinks in zip have mode 0o120000)
-                    if hasattr(zip_info, 'external_attr') and zip_info.external_attr:
-                        # Extract mode from external_attr (first 2 bytes on Unix)
-                        mode = (zip_info.external_attr >> 16) & 0o777
-                        if (zip_info.external_attr >> 28) == 0o12:  # S_IFLNK (symlink)
-                            logger.warning(f"Skipping symlink in zip file: {file_info} (security: symlink attacks)")
-                            continue
-                except (KeyError, AttributeError):
-                    # If we can't determine, proceed with normal validation
-                    pass
-                
-                # Validate path to prevent zip slip attack
-                target_path = (extract_to_resolved / file_info).resolve()
-                try:
-                    target_path.relative_to(extract_to_resolved)
-                except ValueError:
-                    raise ExtractionError(
-                        f"Invalid path in zip file (potential zip slip attack): {file_info}. "
-                        f"Path resolves outside extraction directory: {target_path}"
-                    )
-                zip_ref.extract(file_info, extract_to)
-                
-                # Set secure file permissions after extraction
-                # Set files to 0600 (owner read/write) and directories to 0700 (owner access)
-                extracted_item = extract_to_resolved / file_info
-                if extracted_item.exists():
-                    try:
-                        if extracted_item.is_file():
-                            extracted_item.chmod(0o600)  # Owner read/write only
-                        elif extracted_item.is_dir():
-                            extracted_item.chmod(0o700)  # Owner access only
-                    except (OSError, PermissionError) as e:
-                        # Permission setting may fail on some systems, log but don't fail
-                        logger.debug(f"Could not set permissions for {extracted_item}: {e}")
-        
-        # Set directory permissions on extraction root
+        Args:
+            zip_ref: Open zip file
+            zip_path: Path to the zip file (for log messages)
+        """
         try:
-            extract_to.chmod(0o700)  # Owner access only
-        except (OSError, PermissionError) as e:
-            logger.debug(f"Could not set permissions for extraction directory {extract_to}: {e}")
-        
-        logger.info(f"Extracted {zip_path.name}")
-        return extract_to
+            bad_file = zip_ref.testzip()
+            if bad_file:
+                logger.warning(
+                    f"Zip file '{zip_path.name}' has corrupted entries (first bad file: {bad_file}), "
+                    f"but will attempt extraction anyway"
+                )
+        except OSError as e:
+            # File system errors (like [Errno 22]) might be external drive issues
+            # Log warning but proceed with extraction - actual extraction may work
+            if e.errno == 22:  # Invalid argument
+                logger.warning(
+                    f"Zip validation hit file system error for '{zip_path.name}': {e}. "
+                    f"This may be due to external drive issues. Will attempt extraction anyway. "
+                    f"File size: {zip_path.stat().st_size / (1024*1024):.1f} MB"
+                )
+            else:
+                # For other OSErrors during testzip, also just warn (extraction might still work)
+                logger.warning(
+                    f"Zip validation error for '{zip_path.name}': {e}. "
+                    f"Will attempt extraction anyway."
+                )
+        except Exception as e:
+            # Other exceptions during testzip - warn but continue
+            logger.warning(
+                f"Zip validation error for '{zip_path.name}': {e}. "
+                f"Will attempt extraction anyway."
+            )
     
     def extract_all_zips(self, zip_files: List[Path]) -> Iterator[Path]:
         """
@@ -232,7 +425,9 @@ class Extractor:
         Find all media files in a directory recursively using a generator.
         
         This method uses a generator to avoid loading all file paths into memory
-        at once, which is more memory-efficient for large directories.
+        at once, which is more memory-efficient for large directories. The tree is
+        walked once with os.scandir() and files are matched on their extension
+        (case-insensitive), instead of running a separate glob per extension.
         
         Args:
             directory: Directory to search recursively
@@ -244,40 +439,34 @@ class Extractor:
             This is a generator function that yields results incrementally,
             allowing for memory-efficient processing of large directory structures.
             The results are filtered to exclude __MACOSX files and hidden files.
+            Symlinked directories are not followed.
         """
-        seen_paths = set()  # Track seen paths to avoid duplicates from case-insensitive matching
+        pending_dirs = [str(directory)]
         
-        for ext in MEDIA_EXTENSIONS:
-            # Search for lowercase extensions
-            for file_path in directory.rglob(f"*{ext}"):
-                if file_path in seen_paths:
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            try:
+                with os.scandir(current_dir) as it:
+                    entries = list(it)
+            except OSError as e:
+                logger.debug(f"Could not scan directory {current_dir}: {e}")
+                continue
+            
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending_dirs.append(entry.path)
                     continue
-                seen_paths.add(file_path)
                 
+                if os.path.splitext(entry.name)[1].lower() not in MEDIA_EXTENSIONS:
+                    continue
                 # Skip __MACOSX directory and its contents
-                if '__MACOSX' in str(file_path):
+                if '__MACOSX' in entry.path:
                     continue
                 # Skip hidden files starting with ._
-                if file_path.name.startswith('._'):
+                if entry.name.startswith('._'):
                     continue
                 
-                yield file_path
-            
-            # Search for uppercase extensions (avoid duplicate processing)
-            if ext != ext.upper():
-                for file_path in directory.rglob(f"*{ext.upper()}"):
-                    if file_path in seen_paths:
-                        continue
-                    seen_paths.add(file_path)
-                    
-                    # Skip __MACOSX directory and its contents
-                    if '__MACOSX' in str(file_path):
-                        continue
-                    # Skip hidden files starting with ._
-                    if file_path.name.startswith('._'):
-                        continue
-                    
-                    yield file_path
+                yield Path(entry.path)
     
     def find_media_files_list(self, directory: Path) -> List[Path]:
         """
@@ -321,6 +510,28 @@ class Extractor:
         
         return None
     
+    def _json_names_in(self, directory: Path, cache: Dict[Path, Set[str]]) -> Set[str]:
+        """
+        Get the names of JSON files in a directory, scanning it at most once.
+        
+        Args:
+            directory: Directory to scan (not recursive)
+            cache: Mapping of already-scanned directories to their JSON file names
+        
+        Returns:
+            Set of JSON file names in the directory
+        """
+        names = cache.get(directory)
+        if names is None:
+            try:
+                with os.scandir(directory) as it:
+                    names = {entry.name for entry in it if entry.name.endswith('.json')}
+            except OSError as e:
+                logger.debug(f"Could not scan {directory} for JSON metadata: {e}")
+                names = set()
+            cache[directory] = names
+        return names
+    
     def identify_media_json_pairs(self, directory: Path) -> Dict[Path, Optional[Path]]:
         """
         Identify all media files and their corresponding JSON metadata files.
@@ -336,15 +547,24 @@ class Extractor:
         
         Note:
             Uses generator-based file discovery for memory efficiency with large directories.
+            JSON lookups use the same naming rule as find_json_metadata(), but each
+            directory is scanned once rather than probing the filesystem per file.
         """
         pairs = {}
         media_count = 0
         json_count = 0
+        # JSON sidecar names per directory, so each directory is listed once
+        # instead of stat'ing candidate paths for every media file
+        json_index: Dict[Path, Set[str]] = {}
         
         # Use generator for memory-efficient processing
         for media_file in self.find_media_files(directory):
             media_count += 1
-            json_file = self.find_json_metadata(media_file)
+            json_name = f"{media_file.stem}.json"
+            if json_name in self._json_names_in(media_file.parent, json_index):
+                json_file = media_file.parent / json_name
+            else:
+                json_file = None
             pairs[media_file] = json_file
             if json_file is not None:
                 json_count += 1
@@ -16,6 +16,10 @@ from tqdm import tqdm
 import tempfile
 
 from google_photos_icloud_migration.exceptions import MetadataError
+from google_photos_icloud_migration.utils.json_io import read_json
+from google_photos_icloud_migration.processor.video_converter import (
+    VideoConverter, UNSUPPORTED_VIDEO_FORMATS
+)
 
 logger = logging.getLogger(__name__)
 
@@ -109,8 +113,7 @@ class MetadataMerger:
                     del self._metadata_cache[json_path]
         
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+            metadata = read_json(json_path)
             
             # Cache the parsed metadata if caching is enabled
             if use_cache and self.cache_metadata:
@@ -383,13 +386,8 @@ class MetadataMerger:
         for media_file, json_file in tqdm(media_json_pairs.items(), 
                                           desc="Merging metadata"):
             # Check if video conversion is needed for sequential processing
-            if video_converter is None:
-                try:
-                    from google_photos_icloud_migration.processor.video_converter import VideoConverter, UNSUPPORTED_VIDEO_FORMATS
-                    if media_file.suffix.lower() in UNSUPPORTED_VIDEO_FORMATS:
-                        video_converter = VideoConverter(output_format='mov', preserve_metadata=True)
-                except ImportError:
-                    pass
+            if video_converter is None and media_file.suffix.lower() in UNSUPPORTED_VIDEO_FORMATS:
+                video_converter = VideoConverter(output_format='mov', preserve_metadata=True)
             
             processed_file = self._prepare_file_for_processing(
                 media_file, json_file, output_dir, video_converter
@@ -502,14 +500,10 @@ class MetadataMerger:
         
         # Check if video conversion is needed
         needs_conversion = False
-        if video_converter is None:
+        if video_converter is None and media_file.suffix.lower() in UNSUPPORTED_VIDEO_FORMATS:
+            needs_conversion = True
             try:
-                from google_photos_icloud_migration.processor.video_converter import VideoConverter, UNSUPPORTED_VIDEO_FORMATS
-                if media_file.suffix.lower() in UNSUPPORTED_VIDEO_FORMATS:
-                    needs_conversion = True
-                    video_converter = VideoConverter(output_format='mov', preserve_metadata=True)
-            except ImportError:
-                pass
+                video_converter = VideoConverter(output_format='mov', preserve_metadata=True)
             except Exception as e:
                 logger.debug(f"Error checking video conversion: {e}")
         
@@ -1,12 +1,13 @@
 """
 Statistics tracking for migration process.
 """
-import json
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 from collections import defaultdict
 
+from google_photos_icloud_migration.utils.json_io import write_json
+
 
 class MigrationStatistics:
     """Tracks statistics throughout the migration process."""
@@ -213,5 +214,4 @@ class MigrationStatistics:
     
     def save(self, file_path: Path):
         """Save statistics to JSON file."""
-        with open(file_path, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+        write_json(file_path, self.to_dict())
@@ -1191,17 +1191,17 @@ class iCloudPhotosSyncUploader:
         
         # Filter out files that don't exist before processing
         existing_files = []
-        missing_files = []
+        missing_count = 0
         for file_path in file_paths:
             if file_path.exists():
                 existing_files.append(file_path)
             else:
-                missing_files.append(file_path)
+                missing_count += 1
                 logger.warning(f"File does not exist, skipping: {file_path}")
                 results[file_path] = False
         
-        if missing_files:
-            logger.warning(f"Skipping {len(missing_files)} missing files out of {len(file_paths)} total")
+        if missing_count:
+            logger.warning(f"Skipping {missing_count} missing files out of {len(file_paths)} total")
         
         if not existing_files:
             logger.warning("No existing files to upload")
@@ -0,0 +1,109 @@
+"""
+JSON serialization helpers for migration tracking files.
+
+This module provides:
+- Fast serialization and parsing using orjson when it is installed
+- Transparent fallback to the standard library json module
+- Atomic file writes (temporary file + rename)
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Try to import orjson for faster serialization of large tracking files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.debug("orjson library not available - using standard json module")
+
+
+def dumps_json(data: Any) -> bytes:
+    """
+    Serialize data to indented JSON bytes.
+
+    Uses orjson when available and falls back to the standard library for
+    data orjson cannot handle (e.g. non-string dictionary keys).
+
+    Args:
+        data: JSON-serializable object
+
+    Returns:
+        UTF-8 encoded JSON document indented with two spaces
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def loads_json(data: bytes) -> Any:
+    """
+    Parse a JSON document.
+
+    Uses orjson when available. Its decode errors subclass
+    json.JSONDecodeError, so callers can catch the standard exception either way.
+
+    Args:
+        data: UTF-8 encoded JSON document
+
+    Returns:
+        Parsed object
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: Path) -> Any:
+    """
+    Read and parse a JSON file.
+
+    Args:
+        path: File to read
+
+    Returns:
+        Parsed object
+
+    Raises:
+        OSError: If the file cannot be read
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    return loads_json(Path(path).read_bytes())
+
+
+def write_json(path: Path, data: Any) -> None:
+    """
+    Atomically write data to a JSON file.
+
+    The document is written to a temporary file next to the destination and
+    moved into place with os.replace(), so a crash mid-write never leaves a
+    truncated file behind.
+
+    Args:
+        path: Destination file path
+        data: JSON-serializable object
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        tmp_path.write_bytes(dumps_json(data))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
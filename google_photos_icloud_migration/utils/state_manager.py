@@ -14,6 +14,8 @@ from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 from enum import Enum
 
+from google_photos_icloud_migration.utils.json_io import read_json, write_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,6 +92,15 @@ class StateManager:
         self._file_state: Dict[str, Dict] = {}
         self._checkpoint: Optional[Dict] = None
         
+        # Index of zip names by state value, kept in sync with _zip_state
+        # (dicts used as insertion-ordered sets)
+        self._zips_by_state: Dict[str, Dict[str, None]] = {}
+        
+        # Batched writes: while a batch is open, state is only written on flush
+        self._batch_depth = 0
+        self._zip_state_dirty = False
+        self._file_state_dirty = False
+        
         # Load existing state
         self._load_state()
     
@@ -98,8 +109,7 @@ class StateManager:
         # Load zip state
         if self.zip_state_file.exists():
             try:
-                with open(self.zip_state_file, 'r') as f:
-                    self._zip_state = json.load(f)
+                self._zip_state = read_json(self.zip_state_file)
                 logger.info(f"📂 Loaded state from: {self.zip_state_file}")
                 logger.info(f"   Found {len(self._zip_state)} zip files in state")
                 # Count completed zips
@@ -119,8 +129,7 @@ class StateManager:
         # Load file state
         if self.file_state_file.exists():
             try:
-                with open(self.file_state_file, 'r') as f:
-                    self._file_state = json.load(f)
+                self._file_state = read_json(self.file_state_file)
                 logger.debug(f"Loaded {len(self._file_state)} file states from {self.file_state_file}")
             except (json.JSONDecodeError, IOError) as e:
                 logger.warning(f"Could not load file state: {e}")
@@ -128,11 +137,12 @@ class StateManager:
         else:
             self._file_state = {}
         
+        self._rebuild_zip_index()
+        
         # Load checkpoint
         if self.checkpoint_file.exists():
             try:
-                with open(self.checkpoint_file, 'r') as f:
-                    self._checkpoint = json.load(f)
+                self._checkpoint = read_json(self.checkpoint_file)
                 logger.debug(f"Loaded checkpoint from {self.checkpoint_file}")
             except (json.JSONDecodeError, IOError) as e:
                 logger.warning(f"Could not load checkpoint: {e}")
@@ -140,11 +150,16 @@ class StateManager:
         else:
             self._checkpoint = None
     
+    def _rebuild_zip_index(self):
+        """Rebuild the zip-by-state index from the zip state cache."""
+        self._zips_by_state = {}
+        for zip_name, data in self._zip_state.items():
+            self._zips_by_state.setdefault(data.get('state'), {})[zip_name] = None
+    
     def _save_zip_state(self):
         """Save zip state to file."""
         try:
-            with open(self.zip_state_file, 'w') as f:
-                json.dump(self._zip_state, f, indent=2)
+            write_json(self.zip_state_file, self._zip_state)
             logger.debug(f"State saved to: {self.zip_state_file}")
         except IOError as e:
             logger.error(f"❌ Could not save zip state to {self.zip_state_file}: {e}")
@@ -153,19 +168,44 @@ class StateManager:
     def _save_file_state(self):
         """Save file state to file."""
         try:
-            with open(self.file_state_file, 'w') as f:
-                json.dump(self._file_state, f, indent=2)
+            write_json(self.file_state_file, self._file_state)
         except IOError as e:
             logger.error(f"Could not save file state: {e}")
     
     def _save_checkpoint(self):
         """Save checkpoint to file."""
         try:
-            with open(self.checkpoint_file, 'w') as f:
-                json.dump(self._checkpoint, f, indent=2)
+            write_json(self.checkpoint_file, self._checkpoint)
         except IOError as e:
             logger.error(f"Could not save checkpoint: {e}")
     
+    # Batched write methods
+    def begin_batch(self):
+        """
+        Start a batch of state changes.
+        
+        Until the matching end_batch() call, zip and file state changes are kept
+        in memory and written once instead of rewriting the state files on every
+        change. Batches may be nested; state is written when the outermost batch ends.
+        """
+        self._batch_depth += 1
+    
+    def end_batch(self):
+        """End a batch of state changes, writing pending changes if it is the outermost batch."""
+        if self._batch_depth > 0:
+            self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.flush()
+    
+    def flush(self):
+        """Write any pending zip and file state changes to disk."""
+        if self._zip_state_dirty:
+            self._zip_state_dirty = False
+            self._save_zip_state()
+        if self._file_state_dirty:
+            self._file_state_dirty = False
+            self._save_file_state()
+    
     # Zip state methods
     def get_zip_state(self, zip_name: str) -> Optional[str]:
         """Get current state of a zip file."""
@@ -186,21 +226,36 @@ class StateManager:
         if zip_name not in self._zip_state:
             self._zip_state[zip_name] = {}
         
+        previous_state = self._zip_state[zip_name].get('state')
+        if previous_state != state.value:
+            self._zips_by_state.get(previous_state, {}).pop(zip_name, None)
+            self._zips_by_state.setdefault(state.value, {})[zip_name] = None
+        
         self._zip_state[zip_name]['state'] = state.value
         self._zip_state[zip_name]['updated_at'] = datetime.now().isoformat()
         
         if metadata:
             self._zip_state[zip_name].update(metadata)
         
-        self._save_zip_state()
+        if self._batch_depth:
+            self._zip_state_dirty = True
+        else:
+            self._save_zip_state()
         logger.debug(f"Updated zip state: {zip_name} -> {state.value}")
     
+    def snapshot(self) -> Dict[str, Optional[str]]:
+        """
+        Get the current state of every known zip file.
+        
+        Returns:
+            Dictionary mapping zip names to state values (a copy; later changes
+            are not reflected)
+        """
+        return {zip_name: data.get('state') for zip_name, data in self._zip_state.items()}
+    
     def get_zips_by_state(self, state: ZipProcessingState) -> List[str]:
         """Get all zip names in a specific state."""
-        return [
-            zip_name for zip_name, data in self._zip_state.items()
-            if data.get('state') == state.value
-        ]
+        return list(self._zips_by_state.get(state.value, ()))
     
     def is_zip_complete(self, zip_name: str) -> bool:
         """Check if zip processing is complete."""
@@ -250,7 +305,10 @@ class StateManager:
         if metadata:
             self._file_state[file_path].update(metadata)
         
-        self._save_file_state()
+        if self._batch_depth:
+            self._file_state_dirty = True
+        else:
+            self._save_file_state()
         logger.debug(f"Updated file state: {Path(file_path).name} -> {state.value}")
     
     def get_files_by_state(self, state: FileProcessingState) -> List[str]:
@@ -388,8 +446,11 @@ class StateManager:
     def clear_state(self):
         """Clear all state (for restart from scratch)."""
         self._zip_state = {}
+        self._zips_by_state = {}
         self._file_state = {}
         self._checkpoint = None
+        self._zip_state_dirty = False
+        self._file_state_dirty = False
         
         if self.zip_state_file.exists():
             self.zip_state_file.unlink()
@@ -19,6 +19,7 @@ from google_photos_icloud_migration.processor.metadata_merger import MetadataMer
 from google_photos_icloud_migration.parser.album_parser import AlbumParser
 from google_photos_icloud_migration.uploader.icloud_uploader import iCloudPhotosSyncUploader
 from google_photos_icloud_migration.downloader.drive_downloader import DriveDownloader
+from google_photos_icloud_migration.utils.file_ops import dir_has_entries
 
 logger = logging.getLogger(__name__)
 
@@ -239,7 +240,7 @@ def fix_albums_for_zip(zip_path: Path, config_path: str, wrong_album_name: str =
     extracted_dir_base = extractor.extracted_dir / zip_base
     
     # Check if we have processed files but need to re-extract for JSON metadata
-    processed_files_exist = processed_dir.exists() and any(processed_dir.iterdir())
+    processed_files_exist = dir_has_entries(processed_dir)
     extracted_dir_exists = extracted_dir_base.exists() and any(extracted_dir_base.rglob('*.json'))
     
     if skip_extraction:
@@ -5,11 +5,18 @@ This script processes local zip files: extracts, processes metadata, and uploads
 """
 import argparse
 import logging
+import multiprocessing
+import os
+import queue
+import shutil
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 import yaml
-import zipfile
 
 # Add parent directory to path to allow imports from package
 script_dir = Path(__file__).parent
@@ -17,205 +24,335 @@ project_root = script_dir.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from google_photos_icloud_migration.config import YamlSafeLoader
 from google_photos_icloud_migration.processor.extractor import Extractor
 from google_photos_icloud_migration.processor.metadata_merger import MetadataMerger
 from google_photos_icloud_migration.parser.album_parser import AlbumParser
 from google_photos_icloud_migration.uploader.icloud_uploader import iCloudPhotosSyncUploader
+from google_photos_icloud_migration.utils.file_ops import remove_tree
 from google_photos_icloud_migration.utils.logging_config import setup_logging
 from google_photos_icloud_migration.utils.state_manager import StateManager, ZipProcessingState
 
 logger = logging.getLogger(__name__)
 
+# Lock shared by worker processes so PhotoKit uploads run one at a time
+_upload_lock = None
 
-def find_zip_files(takeout_dir: Path) -> List[Path]:
-    """Find all takeout zip files in the Takeout directory."""
+# Threads each zip may use for extraction and metadata merging. Worker processes
+# split the CPUs between them; None uses every CPU
+_worker_threads = None
+
+# Removes extracted directories in the background so the next zip can start right away.
+# Pending removals finish before the interpreter exits
+_cleanup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cleanup")
+
+# Zips waiting between pipeline stages. Each one is an extracted copy on disk, but
+# the pipeline only extracts a zip once it fits next to the ones still waiting,
+# so the queues can hold enough prepared zips to upload several in one batch
+PIPELINE_QUEUE_SIZE = 4
+
+# Prepared zips that are already waiting are uploaded together in one PhotoKit
+# batch of up to this many files or compressed zip bytes (pipeline mode). Each
+# waiting zip stays extracted on disk
+UPLOAD_BATCH_FILES = 1000
+UPLOAD_BATCH_MAX_BYTES = 2 * 1024 ** 3
+
+# Free space required before extracting a zip, as a multiple of its compressed size
+# (extracted files plus the processed copies with merged metadata)
+DISK_SPACE_FACTOR = 3
+
+
+def find_zip_files(takeout_dir: Path) -> List[Tuple[Path, int]]:
+    """
+    Find all takeout zip files in the Takeout directory.
+    
+    Returns:
+        Sorted list of (zip file path, size in bytes) tuples
+    """
     zip_files = []
     
-    # Look for zip files matching takeout pattern
-    for item in takeout_dir.iterdir():
-        if item.is_file() and item.suffix.lower() == '.zip':
-            # Check if it matches takeout pattern
-            name_lower = item.name.lower()
-            if 'takeout' in name_lower:
-                zip_files.append(item)
+    # Look for zip files matching takeout pattern. The name is checked first and
+    # scandir's cached entry type is used; only matching zips are stat()ed, once,
+    # for their size
+    with os.scandir(takeout_dir) as entries:
+        for entry in entries:
+            name_lower = entry.name.lower()
+            if name_lower.endswith('.zip') and 'takeout' in name_lower and entry.is_file():
+                zip_files.append((Path(entry.path), entry.stat().st_size))
     
     return sorted(zip_files)
 
 
-def process_zip_file(
+def remove_extracted_dir(extracted_dir: Path):
+    """Delete an extracted directory on the background cleanup thread."""
+    def remove():
+        try:
+            remove_tree(extracted_dir)
+            logger.info(f"✓ Cleaned up extracted directory: {extracted_dir}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Error during cleanup of {extracted_dir}: {e}")
+    
+    logger.info(f"Cleaning up extracted directory: {extracted_dir}")
+    _cleanup_pool.submit(remove)
+
+
+def wait_for_cleanup():
+    """Wait for the extracted directories queued for removal so far to be deleted."""
+    # The pool has a single thread, so this no-op runs after every earlier removal
+    _cleanup_pool.submit(lambda: None).result()
+
+
+@dataclass
+class PreparedZip:
+    """A zip file that has been extracted and had its metadata merged, ready to upload."""
+    zip_path: Path
+    extracted_dir: Path
+    processed_files: List[Path]
+    file_to_album: Dict[Path, Optional[str]]
+
+
+def disk_space_shortfall(zip_path: Path, extractor: Extractor, reserved_bytes: int = 0) -> Optional[str]:
+    """
+    Check whether there is enough free disk space to process a zip file.
+    
+    If space is short, waits for pending removals of extracted directories and
+    checks again.
+    
+    Args:
+        reserved_bytes: Space still to be used by other zips that are extracted
+                       but not yet uploaded
+    
+    Returns:
+        Error message if there is not enough space, otherwise None
+    
+    Raises:
+        OSError: If the zip size or the free space cannot be read
+    """
+    needed = zip_path.stat().st_size * DISK_SPACE_FACTOR + reserved_bytes
+    free = shutil.disk_usage(extractor.extracted_dir).free
+    if free < needed:
+        wait_for_cleanup()
+        free = shutil.disk_usage(extractor.extracted_dir).free
+    if free >= needed:
+        return None
+    return (f"Not enough disk space to process {zip_path.name}: "
+            f"{free / (1024 ** 3):.2f} GB free, about {needed / (1024 ** 3):.2f} GB needed")
+
+
+def extract_stage(
     zip_path: Path,
-    base_dir: Path,
     extractor: Extractor,
-    metadata_merger: MetadataMerger,
-    album_parser: AlbumParser,
-    uploader: iCloudPhotosSyncUploader,
-    zip_number: int,
-    total_zips: int,
-    cleanup: bool = True,
-    state_manager: Optional[StateManager] = None
-) -> bool:
-    """Process a single zip file: extract, process metadata, upload."""
-    logger.info("=" * 60)
-    logger.info(f"Processing zip {zip_number}/{total_zips}: {zip_path.name}")
-    logger.info("=" * 60)
+    state_manager: Optional[StateManager] = None,
+    reserved_bytes: int = 0
+) -> Optional[Path]:
+    """
+    Validate and extract a zip file.
     
-    # Check if zip was already processed
-    if state_manager:
-        if state_manager.is_zip_complete(zip_path.name):
-            logger.info(f"⏭️  Skipping {zip_path.name} - already processed successfully")
-            return True
+    Args:
+        reserved_bytes: Space still to be used by other zips that are extracted
+                       but not yet uploaded (pipeline mode)
     
+    Returns:
+        Extracted directory, or None if the zip is invalid or could not be extracted
+    """
+    # Check free space first so a zip that cannot fit is skipped before extraction starts
     try:
-        # Validate zip file (basic validation - check if we can open and list it)
-        try:
-            with zipfile.ZipFile(zip_path, 'r') as test_zip:
-                # Basic validation: try to list entries
-                entry_count = len(test_zip.namelist())
-                logger.debug(f"Zip file {zip_path.name} has {entry_count} entries")
-                
-                # Try full validation, but don't fail hard if it hits file system issues
-                try:
-                    bad_file = test_zip.testzip()
-                    if bad_file:
-                        logger.warning(f"Zip file {zip_path.name} has corrupted entries, but will attempt extraction")
-                except OSError as e:
-                    # File system errors (like [Errno 22]) might be external drive issues
-                    # Log warning but proceed with extraction
-                    if e.errno == 22:  # Invalid argument
-                        logger.warning(
-                            f"Zip validation hit file system error for {zip_path.name}: {e}. "
-                            f"This may be due to external drive issues. Will attempt extraction anyway."
-                        )
-                    else:
-                        raise
-        except zipfile.BadZipFile:
-            logger.error(f"Invalid or corrupted zip file: {zip_path.name}")
-            return False
-        except Exception as e:
-            logger.error(f"Error validating zip file {zip_path.name}: {e}")
-            return False
-        
-        # Extract the zip file
-        logger.info(f"Extracting {zip_path.name}...")
-        try:
-            extracted_dir = extractor.extract_zip(zip_path)
-            logger.info(f"Extracted to: {extracted_dir}")
-            if state_manager:
-                state_manager.mark_zip_extracted(zip_path.name, str(extracted_dir))
-        except Exception as e:
-            logger.error(f"Error extracting {zip_path.name}: {e}")
+        message = disk_space_shortfall(zip_path, extractor, reserved_bytes)
+    except OSError as e:
+        logger.warning(f"Could not check free disk space for {zip_path.name}: {e}")
+    else:
+        if message:
+            logger.error(f"❌ {message}")
             if state_manager:
                 state_manager.mark_zip_failed(
                     zip_path.name,
                     ZipProcessingState.FAILED_EXTRACTION,
-                    str(e)
+                    message
                 )
-            return False
-        
-        # Find the Google Photos subfolder
-        google_photos_path = extracted_dir / "Google Photos"
-        if not google_photos_path.exists():
-            logger.warning(f"No 'Google Photos' folder found in {zip_path.name}")
-            # Try to use the extracted directory directly
-            source_dir = extracted_dir
+            return None
+    
+    # Then validate and extract the zip file. Validation is a cheap central directory
+    # check on the same open handle, plus CRC checks of every entry (testzip) only when
+    # deep validation is enabled
+    logger.info(f"Extracting {zip_path.name}...")
+    try:
+        extracted_dir = extractor.extract_zip_parallel(zip_path, max_workers=_worker_threads)
+        logger.info(f"Extracted to: {extracted_dir}")
+        if state_manager:
+            state_manager.mark_zip_extracted(zip_path.name, str(extracted_dir))
+    except Exception as e:
+        logger.error(f"Error extracting {zip_path.name}: {e}")
+        if state_manager:
+            state_manager.mark_zip_failed(
+                zip_path.name,
+                ZipProcessingState.FAILED_EXTRACTION,
+                str(e)
+            )
+        return None
+    
+    return extracted_dir
+
+
+def prepare_stage(
+    zip_path: Path,
+    extracted_dir: Path,
+    base_dir: Path,
+    extractor: Extractor,
+    metadata_merger: MetadataMerger,
+    album_parser: AlbumParser,
+    cleanup: bool = True
+) -> Optional[PreparedZip]:
+    """
+    Merge metadata into the media files of an extracted zip and map them to albums.
+    
+    Returns:
+        Prepared zip, or None if there is nothing to upload
+    """
+    # Find the Google Photos subfolder
+    google_photos_path = extracted_dir / "Google Photos"
+    if not google_photos_path.exists():
+        logger.warning(f"No 'Google Photos' folder found in {zip_path.name}")
+        # Try to use the extracted directory directly
+        source_dir = extracted_dir
+    else:
+        source_dir = google_photos_path
+    
+    logger.info(f"Source directory: {source_dir}")
+    
+    # Identify media files and their JSON metadata
+    logger.info("Identifying media files and metadata...")
+    media_json_pairs = extractor.identify_media_json_pairs(source_dir)
+    
+    if not media_json_pairs:
+        logger.warning(f"No media files found in {zip_path.name}")
+        if cleanup:
+            remove_extracted_dir(extracted_dir)
+        return None
+    
+    logger.info(f"Found {len(media_json_pairs)} media files")
+    
+    # Process metadata
+    logger.info("Processing metadata...")
+    processed_dir = base_dir / "processed" / zip_path.stem
+    try:
+        processed_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        if e.errno == 28:  # No space left on device
+            logger.error(f"❌ No space left on device. Cannot create processed directory: {processed_dir}")
+            logger.error("Please free up disk space and try again.")
+            return None
         else:
-            source_dir = google_photos_path
-        
-        logger.info(f"Source directory: {source_dir}")
-        
-        # Identify media files and their JSON metadata
-        logger.info("Identifying media files and metadata...")
-        media_json_pairs = extractor.identify_media_json_pairs(source_dir)
-        
-        if not media_json_pairs:
-            logger.warning(f"No media files found in {zip_path.name}")
-            if cleanup:
-                logger.info(f"Cleaning up extracted directory: {extracted_dir}")
-                import shutil
-                shutil.rmtree(extracted_dir, ignore_errors=True)
-            return False
-        
-        logger.info(f"Found {len(media_json_pairs)} media files")
-        
-        # Process metadata
-        logger.info("Processing metadata...")
-        processed_dir = base_dir / "processed" / zip_path.stem
-        try:
-            processed_dir.mkdir(parents=True, exist_ok=True)
-        except OSError as e:
-            if e.errno == 28:  # No space left on device
-                logger.error(f"❌ No space left on device. Cannot create processed directory: {processed_dir}")
-                logger.error("Please free up disk space and try again.")
-                return False
-            else:
-                raise
-        
-        # Use merge_all_metadata which handles copying to output_dir and merging
-        results = metadata_merger.merge_all_metadata(media_json_pairs, output_dir=processed_dir)
-        processed_files = [file_path for file_path, success in results.items() if success]
-        
-        logger.info(f"Processed {len(processed_files)} files with metadata")
-        
-        # Parse albums
-        logger.info("Parsing album structure...")
-        albums = album_parser.parse_from_directory_structure(source_dir)
-        logger.info(f"Found {len(albums)} albums")
-        
-        # Upload files
-        logger.info("Uploading to iCloud Photos...")
+            raise
+    
+    # Use merge_all_metadata which handles copying to output_dir and merging
+    # (concurrently across files unless parallel processing is disabled)
+    results = metadata_merger.merge_all_metadata(media_json_pairs, output_dir=processed_dir)
+    processed_files = [file_path for file_path, success in results.items() if success]
+    
+    logger.info(f"Processed {len(processed_files)} files with metadata")
+    
+    # Parse albums
+    logger.info("Parsing album structure...")
+    albums = album_parser.parse_from_directory_structure(source_dir)
+    logger.info(f"Found {len(albums)} albums")
+    
+    # Build file-to-album mapping
+    file_to_album = dict.fromkeys(processed_files)
+    if albums:
+        # Album of each original file (its top-level folder), indexed by stem so each
+        # processed file is matched with one lookup instead of scanning all originals
+        # Works on plain strings to avoid building a relative Path per file
+        source_prefix = os.path.join(os.fspath(source_dir), '')
+        prefix_len = len(source_prefix)
+        album_by_stem = {}
+        for orig_file in media_json_pairs:
+            orig_str = os.fspath(orig_file)
+            album = None
+            if orig_str.startswith(source_prefix):
+                sep_index = orig_str.find(os.sep, prefix_len)
+                if sep_index > prefix_len:
+                    album = orig_str[prefix_len:sep_index]
+            album_by_stem.setdefault(orig_file.stem, album)
         
-        # Build file-to-album mapping
-        file_to_album = {}
         for processed_file in processed_files:
-            album_name = None
-            if albums:
-                # Find which album this file belongs to
-                original_path = None
-                for orig_file, json_file in media_json_pairs.items():
-                    # Try to match processed file to original
-                    if processed_file.name.startswith(orig_file.stem):
-                        original_path = orig_file
-                        break
-                
-                if original_path:
-                    # Find album from path
-                    rel_path = original_path.relative_to(source_dir)
-                    if len(rel_path.parts) > 1:
-                        album_name = rel_path.parts[0]
-            
-            file_to_album[processed_file] = album_name
-        
-        # Use batch upload for better performance
-        if hasattr(uploader, 'upload_files_batch'):
-            logger.info(f"Uploading {len(processed_files)} files using batch upload...")
-            results = uploader.upload_files_batch(
-                processed_files,
-                albums=file_to_album,
-                verify_after_upload=True
-            )
-            uploaded_count = sum(1 for success in results.values() if success)
-            failed_count = len(results) - uploaded_count
-        else:
-            # Fallback to individual uploads
-            uploaded_count = 0
-            failed_count = 0
-            for processed_file in processed_files:
-                try:
-                    album_name = file_to_album.get(processed_file)
-                    result = uploader.upload_file(
-                        processed_file,
-                        album_name=album_name
-                    )
-                    if result:
-                        uploaded_count += 1
-                    else:
-                        failed_count += 1
-                        logger.warning(f"Failed to upload {processed_file.name}")
-                except Exception as e:
-                    failed_count += 1
-                    logger.error(f"Error uploading {processed_file.name}: {e}")
+            # Processed copies keep the original name; fall back to the part before
+            # the first dot for copies with extra suffixes (e.g. "IMG_1.edited.jpg")
+            stem = processed_file.stem
+            if stem not in album_by_stem:
+                stem = processed_file.name.split('.', 1)[0]
+            file_to_album[processed_file] = album_by_stem.get(stem)
+    
+    return PreparedZip(zip_path, extracted_dir, processed_files, file_to_album)
+
+
+def upload_stage(
+    prepared: PreparedZip,
+    uploader: iCloudPhotosSyncUploader,
+    cleanup: bool = True,
+    state_manager: Optional[StateManager] = None,
+    upload_lock=None
+) -> bool:
+    """
+    Upload a prepared zip's files, record the result and clean up.
+    
+    Args:
+        upload_lock: Optional lock held while uploading, so zips processed in
+                    parallel still copy to the Photos library one at a time
+    
+    Returns:
+        True if at least one file was uploaded
+    """
+    results = upload_prepared_zips([prepared], uploader, cleanup, state_manager, upload_lock)
+    return results[prepared.zip_path]
+
+
+def upload_prepared_zips(
+    prepared_zips: List[PreparedZip],
+    uploader: iCloudPhotosSyncUploader,
+    cleanup: bool = True,
+    state_manager: Optional[StateManager] = None,
+    upload_lock=None
+) -> Dict[Path, bool]:
+    """
+    Upload the files of several prepared zips in one batch, then record each zip's result.
+    
+    A single upload_files_batch call amortizes the per-request PhotoKit overhead
+    over all the zips' files; the per-file results are split back by zip.
+    
+    Args:
+        prepared_zips: Zips to upload together
+        uploader: PhotoKit uploader
+        cleanup: Whether to remove the extracted files after uploading
+        state_manager: Optional state manager for recording each zip's result
+        upload_lock: Optional lock held while uploading, so zips processed in
+                    parallel still copy to the Photos library one at a time
+    
+    Returns:
+        Dictionary mapping each zip path to True if at least one of its files was uploaded
+    """
+    processed_files = []
+    file_to_album = {}
+    for prepared in prepared_zips:
+        processed_files.extend(prepared.processed_files)
+        file_to_album.update(prepared.file_to_album)
+    
+    # Upload files (one batch at a time when zips are processed in parallel)
+    if len(prepared_zips) > 1:
+        logger.info("Uploading %d zips to iCloud Photos in one batch...", len(prepared_zips))
+    else:
+        logger.info("Uploading to iCloud Photos...")
+    with upload_lock or nullcontext():
+        file_results = _upload_files(uploader, processed_files, file_to_album)
+    
+    results = {}
+    for prepared in prepared_zips:
+        zip_path = prepared.zip_path
+        uploaded_count = sum(1 for f in prepared.processed_files if file_results.get(f))
+        failed_count = len(prepared.processed_files) - uploaded_count
         
-        logger.info(f"✓ Uploaded {uploaded_count} files, {failed_count} failed")
+        logger.info("✓ %s: uploaded %d files, %d failed", zip_path.name, uploaded_count, failed_count)
         if failed_count > 0:
             logger.warning(f"⚠️  {failed_count} files failed to upload. Check logs for details.")
         
@@ -232,19 +369,389 @@ def process_zip_file(
         
         # Cleanup extracted files if requested
         if cleanup:
-            logger.info(f"Cleaning up extracted directory: {extracted_dir}")
-            import shutil
-            try:
-                shutil.rmtree(extracted_dir, ignore_errors=True)
-                logger.info("✓ Cleanup complete")
-            except Exception as e:
-                logger.warning(f"Error during cleanup: {e}")
+            remove_extracted_dir(prepared.extracted_dir)
         
-        return uploaded_count > 0
+        results[zip_path] = uploaded_count > 0
+    
+    return results
+
+
+def process_zip_file(
+    zip_path: Path,
+    base_dir: Path,
+    extractor: Extractor,
+    metadata_merger: MetadataMerger,
+    album_parser: AlbumParser,
+    uploader: iCloudPhotosSyncUploader,
+    zip_number: int,
+    total_zips: int,
+    cleanup: bool = True,
+    state_manager: Optional[StateManager] = None,
+    upload_lock=None
+) -> bool:
+    """
+    Process a single zip file: extract, process metadata, upload.
+    
+    Args:
+        upload_lock: Optional lock held while uploading, so zips processed in
+                    parallel still copy to the Photos library one at a time
+    """
+    logger.info("=" * 60)
+    logger.info(f"Processing zip {zip_number}/{total_zips}: {zip_path.name}")
+    logger.info("=" * 60)
+    
+    # Check if zip was already processed
+    if state_manager:
+        if state_manager.is_zip_complete(zip_path.name):
+            logger.info(f"⏭️  Skipping {zip_path.name} - already processed successfully")
+            return True
+    
+    # Write this zip's state changes once, when it is done
+    if state_manager:
+        state_manager.begin_batch()
+    try:
+        extracted_dir = extract_stage(zip_path, extractor, state_manager)
+        if extracted_dir is None:
+            return False
+        
+        prepared = prepare_stage(
+            zip_path, extracted_dir, base_dir, extractor, metadata_merger, album_parser, cleanup
+        )
+        if prepared is None:
+            return False
+        
+        return upload_stage(prepared, uploader, cleanup, state_manager, upload_lock)
         
     except Exception as e:
         logger.error(f"Error processing zip {zip_path.name}: {e}", exc_info=True)
         return False
+    finally:
+        if state_manager:
+            state_manager.end_batch()
+
+
+def process_zip_files_pipelined(
+    zip_files: List[Path],
+    base_dir: Path,
+    extractor: Extractor,
+    metadata_merger: MetadataMerger,
+    album_parser: AlbumParser,
+    uploader: iCloudPhotosSyncUploader,
+    cleanup: bool = True,
+    state_manager: Optional[StateManager] = None
+):
+    """
+    Process zip files as a pipeline, yielding results as uploads finish.
+    
+    Extraction and metadata merging run on background threads connected by
+    bounded queues, so the next zips are extracted and prepared while the
+    current ones upload. Zips that are already prepared when an upload starts
+    are uploaded together in one PhotoKit batch of about UPLOAD_BATCH_FILES files
+    or UPLOAD_BATCH_MAX_BYTES of zips; an upload never waits for more zips. The
+    next zip is only extracted once there is room for it next to the zips still
+    waiting to upload. Uploads stay on the calling thread. State is only recorded
+    from the calling thread.
+    
+    Args:
+        zip_files: Zip files to process, in order
+        base_dir: Base working directory
+        extractor: Extractor for validating and extracting zips
+        metadata_merger: Merger for writing metadata into media files
+        album_parser: Parser for the album structure
+        uploader: PhotoKit uploader
+        cleanup: Whether to remove extracted files after uploading
+        state_manager: Optional state manager for skipping and recording zips
+    
+    Yields:
+        Tuple of (zip file path, success flag) as each zip is skipped, fails or
+        has its upload batch finish
+    """
+    pending = []
+    for zip_file in zip_files:
+        if state_manager and state_manager.is_zip_complete(zip_file.name):
+            logger.info(f"⏭️  Skipping {zip_file.name} - already processed successfully")
+            yield zip_file, True
+        else:
+            pending.append(zip_file)
+    
+    extract_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    prepare_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    total_zips = len(pending)
+    
+    # Disk space still to be used by each zip that is extracted but not yet uploaded.
+    # Its extracted copy is already on disk; the processed copies are not
+    reserved = {}
+    space_released = threading.Condition()
+    zip_sizes = {}
+    
+    def has_room(zip_file: Path) -> bool:
+        if not reserved:
+            return True
+        try:
+            return disk_space_shortfall(zip_file, extractor, sum(reserved.values())) is None
+        except OSError:
+            # extract_stage reports the error
+            return True
+    
+    def release(zip_file: Path):
+        with space_released:
+            reserved.pop(zip_file, None)
+            space_released.notify_all()
+    
+    def extract_worker():
+        for i, zip_file in enumerate(pending, 1):
+            logger.info(f"Extracting zip {i}/{total_zips}: {zip_file.name}")
+            try:
+                # Wait for queued zips to upload until this one fits next to them
+                with space_released:
+                    space_released.wait_for(lambda: has_room(zip_file))
+                    reserved_bytes = sum(reserved.values())
+                extracted_dir = extract_stage(zip_file, extractor, reserved_bytes=reserved_bytes)
+                if extracted_dir is not None:
+                    zip_sizes[zip_file] = zip_file.stat().st_size
+                    with space_released:
+                        reserved[zip_file] = zip_sizes[zip_file] * (DISK_SPACE_FACTOR - 1)
+            except Exception as e:
+                logger.error(f"Error extracting zip {zip_file.name}: {e}", exc_info=True)
+                extracted_dir = None
+            extract_queue.put((zip_file, extracted_dir))
+        extract_queue.put(None)
+    
+    def prepare_worker():
+        while (item := extract_queue.get()) is not None:
+            zip_file, extracted_dir = item
+            prepared = None
+            if extracted_dir is not None:
+                try:
+                    prepared = prepare_stage(
+                        zip_file, extracted_dir, base_dir, extractor,
+                        metadata_merger, album_parser, cleanup
+                    )
+                except Exception as e:
+                    logger.error(f"Error processing metadata for {zip_file.name}: {e}", exc_info=True)
+            prepare_queue.put((zip_file, prepared))
+        prepare_queue.put(None)
+    
+    for target, name in ((extract_worker, 'extract'), (prepare_worker, 'prepare')):
+        threading.Thread(target=target, name=f"zip-{name}", daemon=True).start()
+    
+    # Prepared zips waiting to be uploaded together
+    batch = []
+    batch_files = 0
+    batch_bytes = 0
+    uploaded = 0
+    done = False
+    while not done:
+        item = prepare_queue.get()
+        done = item is None
+        if not done:
+            zip_file, prepared = item
+            if prepared is None:
+                release(zip_file)
+                yield zip_file, False
+                continue
+            batch.append(prepared)
+            batch_files += len(prepared.processed_files)
+            batch_bytes += zip_sizes.get(zip_file, 0)
+            # Add zips that are already prepared, but don't hold the upload back for more
+            if (not prepare_queue.empty() and batch_files < UPLOAD_BATCH_FILES
+                    and batch_bytes < UPLOAD_BATCH_MAX_BYTES):
+                continue
+        if not batch:
+            continue
+        
+        names = ", ".join(prepared.zip_path.name for prepared in batch)
+        logger.info("=" * 60)
+        logger.info("Uploading zips %d-%d/%d: %s", uploaded + 1, uploaded + len(batch), total_zips, names)
+        logger.info("=" * 60)
+        try:
+            results = upload_prepared_zips(batch, uploader, cleanup, state_manager)
+        except Exception as e:
+            logger.error("Error uploading zips %s: %s", names, e, exc_info=True)
+            results = {}
+        for prepared in batch:
+            release(prepared.zip_path)
+            yield prepared.zip_path, results.get(prepared.zip_path, False)
+        uploaded += len(batch)
+        batch = []
+        batch_files = 0
+        batch_bytes = 0
+
+
+def _upload_files(
+    uploader: iCloudPhotosSyncUploader,
+    processed_files: List[Path],
+    file_to_album: Dict[Path, Optional[str]]
+) -> Dict[Path, bool]:
+    """Upload processed files, returning a mapping of each file to its success status."""
+    # Use batch upload for better performance
+    if hasattr(uploader, 'upload_files_batch'):
+        logger.info(f"Uploading {len(processed_files)} files using batch upload...")
+        return uploader.upload_files_batch(
+            processed_files,
+            albums=file_to_album,
+            verify_after_upload=True
+        )
+    
+    # Fallback to individual uploads
+    results = {}
+    for processed_file in processed_files:
+        try:
+            album_name = file_to_album.get(processed_file)
+            results[processed_file] = bool(uploader.upload_file(
+                processed_file,
+                album_name=album_name
+            ))
+            if not results[processed_file]:
+                logger.warning(f"Failed to upload {processed_file.name}")
+        except Exception as e:
+            results[processed_file] = False
+            logger.error(f"Error uploading {processed_file.name}: {e}")
+    return results
+
+
+def build_components(
+    config: dict,
+    base_dir: Path
+) -> Tuple[Extractor, MetadataMerger, AlbumParser, iCloudPhotosSyncUploader]:
+    """Create the extractor, metadata merger, album parser and uploader from the config."""
+    extractor = Extractor(
+        base_dir,
+        deep_validation=config.get('processing', {}).get('deep_zip_validation', False)
+    )
+    metadata_config = config['metadata']
+    processing_config = config.get('processing', {})
+    # Merge the files of each zip on a thread pool; exiftool runs as a subprocess,
+    # so threads are enough to keep several invocations in flight. In a worker
+    # process the pool is limited to the worker's share of the CPUs
+    merge_workers = processing_config.get('max_workers')
+    if _worker_threads is not None:
+        merge_workers = min(merge_workers or _worker_threads, _worker_threads)
+    metadata_merger = MetadataMerger(
+        preserve_dates=metadata_config['preserve_dates'],
+        preserve_gps=metadata_config['preserve_gps'],
+        preserve_descriptions=metadata_config['preserve_descriptions'],
+        enable_parallel=processing_config.get('enable_parallel_processing', True),
+        max_workers=merge_workers
+    )
+    album_parser = AlbumParser()
+    
+    # Always use PhotoKit sync method (macOS only)
+    uploader = iCloudPhotosSyncUploader()
+    return extractor, metadata_merger, album_parser, uploader
+
+
+def _init_worker(upload_lock, worker_threads: int, logging_config: dict):
+    """Set up logging, the shared upload lock and the per-zip thread count in a worker process."""
+    global _upload_lock, _worker_threads
+    _upload_lock = upload_lock
+    _worker_threads = worker_threads
+    # Several processes append to the same log, so don't rotate or split it
+    setup_logging(
+        level=logging_config.get('level', 'INFO'),
+        log_file=logging_config.get('file', 'migration.log'),
+        enable_rotation=False,
+        separate_error_log=False
+    )
+
+
+def _process_one(
+    zip_path_str: str,
+    config: dict,
+    base_dir_str: str,
+    cleanup: bool,
+    zip_number: int,
+    total_zips: int
+) -> bool:
+    """
+    Process one zip file in a worker process.
+    
+    Components are built inside the worker because PhotoKit objects cannot be
+    shared between processes. State is recorded by the main process.
+    """
+    base_dir = Path(base_dir_str)
+    extractor, metadata_merger, album_parser, uploader = build_components(config, base_dir)
+    return process_zip_file(
+        Path(zip_path_str),
+        base_dir,
+        extractor,
+        metadata_merger,
+        album_parser,
+        uploader,
+        zip_number,
+        total_zips,
+        cleanup=cleanup,
+        upload_lock=_upload_lock
+    )
+
+
+def process_zip_files_parallel(
+    zip_files: List[Path],
+    config: dict,
+    base_dir: Path,
+    cleanup: bool,
+    max_workers: int,
+    state_manager: Optional[StateManager] = None
+):
+    """
+    Process zip files in worker processes, yielding results as they finish.
+    
+    Extraction and metadata processing of different zips overlap; uploads are
+    serialized with a lock shared by the workers. Workers are started with the
+    "spawn" method since PhotoKit is not fork-safe.
+    
+    Args:
+        zip_files: Zip files to process
+        config: Loaded configuration dictionary
+        base_dir: Base working directory
+        cleanup: Whether to remove extracted files after processing
+        max_workers: Maximum number of worker processes
+        state_manager: Optional state manager for skipping completed zips;
+                      successful zips are recorded from this (the main) process
+    
+    Yields:
+        Tuple of (zip file path, success flag) as each zip is skipped or finishes,
+        in completion order
+    """
+    pending = []
+    for zip_file in zip_files:
+        if state_manager and state_manager.is_zip_complete(zip_file.name):
+            logger.info(f"⏭️  Skipping {zip_file.name} - already processed successfully")
+            yield zip_file, True
+        else:
+            pending.append(zip_file)
+    if not pending:
+        return
+    
+    spawn_context = multiprocessing.get_context("spawn")
+    upload_lock = spawn_context.Lock()
+    total_zips = len(pending)
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=spawn_context,
+        initializer=_init_worker,
+        initargs=(
+            upload_lock,
+            max(1, (os.cpu_count() or 1) // max_workers),
+            config.get('logging', {})
+        )
+    ) as executor:
+        futures = {
+            executor.submit(
+                _process_one, str(zip_file), config, str(base_dir), cleanup, i, total_zips
+            ): zip_file
+            for i, zip_file in enumerate(pending, 1)
+        }
+        for future in as_completed(futures):
+            zip_file = futures[future]
+            try:
+                success = future.result()
+            except Exception as e:
+                logger.error(f"Worker failed while processing {zip_file.name}: {e}")
+                success = False
+            if success and state_manager:
+                state_manager.mark_zip_uploaded(zip_file.name)
+            yield zip_file, success
 
 
 def main():
@@ -279,8 +786,28 @@ def main():
         action="store_true",
         help="Retry processing zip files that previously failed"
     )
+    parser.add_argument(
+        "--deep-validate",
+        action="store_true",
+        help="Verify the CRC of every zip entry before extracting (reads each zip twice)"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Extract and process the next zip files while the current ones upload, "
+             "uploading several zips per PhotoKit batch (cannot be combined with --workers)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of zip files to process in parallel (default: 1). "
+             "Uploads still run one at a time; each worker needs disk space for its extracted zip"
+    )
     
     args = parser.parse_args()
+    if args.pipeline and args.workers > 1:
+        parser.error("--pipeline cannot be combined with --workers greater than 1")
     
     # Load config
     config_path = Path(args.config)
@@ -290,7 +817,10 @@ def main():
         sys.exit(1)
     
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=YamlSafeLoader)
+    
+    if args.deep_validate:
+        config.setdefault('processing', {})['deep_zip_validation'] = True
     
     # Setup logging
     logging_config = config.get('logging', {})
@@ -320,18 +850,22 @@ def main():
         logger.error(f"Takeout directory not found: {takeout_dir}")
         sys.exit(1)
     
-    zip_files = find_zip_files(takeout_dir)
+    # The directory is only listed once; the retry lookup and size log below reuse this
+    zip_sizes = dict(find_zip_files(takeout_dir))
+    zip_files = list(zip_sizes)
+    zips_by_name = {z.name: z for z in zip_files}
     
     if not zip_files:
         logger.error(f"No takeout zip files found in {takeout_dir}")
         logger.info("Looking for zip files matching 'takeout*.zip' pattern")
         sys.exit(1)
     
-    # Filter zip files based on flags
+    # Filter zip files based on flags, looking states up in one in-memory snapshot
+    zip_states = state_manager.snapshot() if state_manager else {}
     if state_manager:
         if args.skip_processed:
             original_count = len(zip_files)
-            zip_files = [z for z in zip_files if not state_manager.is_zip_complete(z.name)]
+            zip_files = [z for z in zip_files if zip_states.get(z.name) != ZipProcessingState.UPLOADED.value]
             skipped_count = original_count - len(zip_files)
             if skipped_count > 0:
                 logger.info(f"⏭️  Skipping {skipped_count} already-processed zip file(s)")
@@ -344,57 +878,64 @@ def main():
                 logger.info(f"🔄 Retrying {len(failed_zips)} previously failed zip file(s)")
                 # Add failed zips to the list if not already there
                 zip_file_names = {z.name for z in zip_files}
+                # Find the actual zip file paths
                 for failed_zip_name in failed_zips:
-                    # Find the actual zip file path
-                    for zip_file in find_zip_files(takeout_dir):
-                        if zip_file.name == failed_zip_name and zip_file.name not in zip_file_names:
-                            zip_files.append(zip_file)
-                            zip_file_names.add(zip_file.name)
-                            break
+                    zip_file = zips_by_name.get(failed_zip_name)
+                    if zip_file is not None and failed_zip_name not in zip_file_names:
+                        zip_files.append(zip_file)
+                        zip_file_names.add(failed_zip_name)
     
     logger.info(f"Found {len(zip_files)} zip file(s) to process:")
     for zip_file in zip_files:
-        size_mb = zip_file.stat().st_size / (1024 * 1024)
+        size_mb = zip_sizes[zip_file] / (1024 * 1024)
         status = ""
         if state_manager:
-            zip_state = state_manager.get_zip_state(zip_file.name)
+            zip_state = zip_states.get(zip_file.name)
             if zip_state == ZipProcessingState.UPLOADED.value:
                 status = " [already processed]"
             elif zip_state in [ZipProcessingState.FAILED_UPLOAD.value, ZipProcessingState.FAILED_EXTRACTION.value]:
                 status = " [retrying]"
         logger.info(f"  - {zip_file.name} ({size_mb:.1f} MB){status}")
     
-    # Setup components (base_dir already initialized above)
-    extractor = Extractor(base_dir)
-    metadata_config = config['metadata']
-    metadata_merger = MetadataMerger(
-        preserve_dates=metadata_config['preserve_dates'],
-        preserve_gps=metadata_config['preserve_gps'],
-        preserve_descriptions=metadata_config['preserve_descriptions']
-    )
-    album_parser = AlbumParser()
-    
-    # Setup uploader - always use PhotoKit sync method (macOS only)
-    logger.info("Using PhotoKit sync method (macOS)")
-    uploader = iCloudPhotosSyncUploader()
-    
     # Process each zip file
     successful = 0
     failed = 0
     
-    for i, zip_file in enumerate(zip_files, 1):
-        if process_zip_file(
-            zip_file,
-            base_dir,
-            extractor,
-            metadata_merger,
-            album_parser,
-            uploader,
-            i,
-            len(zip_files),
-            cleanup=not args.no_cleanup,
-            state_manager=state_manager
-        ):
+    cleanup = not args.no_cleanup
+    max_workers = min(args.workers, multiprocessing.cpu_count(), len(zip_files))
+    logger.info("Using PhotoKit sync method (macOS)")
+    if max_workers > 1:
+        logger.info(f"Processing up to {max_workers} zip files in parallel")
+        results = process_zip_files_parallel(
+            zip_files, config, base_dir, cleanup, max_workers, state_manager=state_manager
+        )
+    else:
+        # Setup components (base_dir already initialized above)
+        extractor, metadata_merger, album_parser, uploader = build_components(config, base_dir)
+        if args.pipeline:
+            results = process_zip_files_pipelined(
+                zip_files, base_dir, extractor, metadata_merger, album_parser, uploader,
+                cleanup=cleanup, state_manager=state_manager
+            )
+        else:
+            results = (
+                (zip_file, process_zip_file(
+                    zip_file,
+                    base_dir,
+                    extractor,
+                    metadata_merger,
+                    album_parser,
+                    uploader,
+                    i,
+                    len(zip_files),
+                    cleanup=cleanup,
+                    state_manager=state_manager
+                ))
+                for i, zip_file in enumerate(zip_files, 1)
+            )
+    
+    for i, (zip_file, success) in enumerate(results, 1):
+        if success:
             successful += 1
         else:
             failed += 1
@@ -406,12 +947,14 @@ def main():
                     "Processing failed"
                 )
         
-        # Ask if user wants to continue (optional - can be removed for fully automated)
         if i < len(zip_files):
             logger.info("")
             logger.info(f"Processed {i}/{len(zip_files)} zip files. Continuing...")
             logger.info("")
     
+    # Let background cleanup finish before reporting
+    _cleanup_pool.shutdown(wait=True)
+    
     logger.info("=" * 60)
     logger.info(f"Processing complete: {successful} successful, {failed} failed")
     logger.info("=" * 60)
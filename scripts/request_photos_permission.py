@@ -71,14 +71,17 @@ def request_permission():
         
         # Request permission
         from Foundation import NSRunLoop, NSDefaultRunLoopMode, NSDate
+        import threading
         import time
         
         auth_status = [None]
         callback_called = [False]
+        callback_event = threading.Event()
         
         def request_callback(status):
             auth_status[0] = status
             callback_called[0] = True
+            callback_event.set()
         
         PHPhotoLibrary.requestAuthorization_(request_callback)
         
@@ -88,11 +91,14 @@ def request_permission():
         print("Waiting for permission response (up to 60 seconds)...")
         
         while not callback_called[0] and (time.time() - start_time) < timeout:
-            NSRunLoop.currentRunLoop().runMode_beforeDate_(
+            # Block in the run loop until an event arrives or the slice ends. If the run
+            # loop has no sources it returns at once; then wait on the callback itself
+            # (it may arrive on another queue) instead of spinning
+            if not NSRunLoop.currentRunLoop().runMode_beforeDate_(
                 NSDefaultRunLoopMode,
-                NSDate.dateWithTimeIntervalSinceNow_(0.1)
-            )
-            time.sleep(0.1)
+                NSDate.dateWithTimeIntervalSinceNow_(0.5)
+            ):
+                callback_event.wait(0.5)
         
         if not callback_called[0]:
             print("⚠️  Permission request timed out")
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Script to set GitHub repository description and topics via API.
+Script to set GitHub repository description and topics via the GraphQL API.
 
 Requires:
 - GitHub personal access token with 'repo' scope
@@ -17,6 +17,9 @@ Usage:
 
     # Option 3: Pass as argument
     python scripts/set_github_repo_info.py --token your_token_here
+
+Optionally set GITHUB_REPO_ID (the repository's GraphQL node ID) to skip
+looking it up.
 """
 
 import os
@@ -25,6 +28,8 @@ import json
 import argparse
 import requests
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables from .env file if it exists
 try:
@@ -67,6 +72,22 @@ TOPICS = [
     "terminal-tool"
 ]
 
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+REPO_ID_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) { id }
+}
+"""
+
+# Description and topics are updated together in one request
+UPDATE_REPO_MUTATION = """
+mutation($id: ID!, $description: String!, $topics: [String!]!) {
+  updateRepository(input: {repositoryId: $id, description: $description}) { clientMutationId }
+  updateTopics(input: {repositoryId: $id, topicNames: $topics}) { clientMutationId }
+}
+"""
+
 
 def get_token():
     """Get GitHub token from .env file, environment variable, or argument."""
@@ -103,48 +124,70 @@ def get_token():
     return token
 
 
-def set_repo_description(token, description):
-    """Set repository description."""
-    url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}"
-    headers = {
+def create_session(token):
+    """
+    Create an authenticated session for the GitHub API.
+    
+    All requests share one connection (a single TLS handshake), and transient
+    gateway errors are retried with backoff.
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[502, 503, 504],
+        # The mutation sets absolute values, so retrying the POST is safe
+        allowed_methods=frozenset({"GET", "POST"})
+    )
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    session.headers.update({
         "Authorization": f"token {token}",
         "Accept": "application/vnd.github.v3+json"
-    }
-    data = {
-        "description": description
-    }
-    
-    response = requests.patch(url, headers=headers, json=data)
-    if response.status_code == 200:
-        print(f"✅ Description set: {description}")
-        return True
-    else:
-        print(f"❌ Failed to set description: {response.status_code}")
-        print(f"   {response.text}")
-        return False
+    })
+    return session
 
 
-def set_repo_topics(token, topics):
-    """Set repository topics."""
-    url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/topics"
-    headers = {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github.mercy-preview+json"  # Required for topics API
-    }
-    data = {
-        "names": topics
-    }
+def get_repo_id(session):
+    """
+    Get the GraphQL node ID of the repository.
     
-    response = requests.put(url, headers=headers, json=data)
-    if response.status_code == 200:
-        print(f"✅ Topics set ({len(topics)} topics):")
-        for topic in topics:
-            print(f"   - {topic}")
-        return True
-    else:
-        print(f"❌ Failed to set topics: {response.status_code}")
+    Uses GITHUB_REPO_ID from the environment (or .env) when set, which saves
+    a round trip; otherwise it is looked up.
+    """
+    repo_id = os.getenv('GITHUB_REPO_ID')
+    if repo_id:
+        return repo_id.strip()
+    
+    response = session.post(GRAPHQL_URL, json={
+        "query": REPO_ID_QUERY,
+        "variables": {"owner": REPO_OWNER, "name": REPO_NAME}
+    })
+    payload = response.json() if response.status_code == 200 else {}
+    repository = (payload.get("data") or {}).get("repository")
+    if not repository:
+        print(f"❌ Failed to look up repository: {response.status_code}")
         print(f"   {response.text}")
+        return None
+    return repository["id"]
+
+
+def set_repo_info(session, repo_id, description, topics):
+    """Set repository description and topics in a single GraphQL request."""
+    response = session.post(GRAPHQL_URL, json={
+        "query": UPDATE_REPO_MUTATION,
+        "variables": {"id": repo_id, "description": description, "topics": topics}
+    })
+    payload = response.json() if response.status_code == 200 else {}
+    if response.status_code != 200 or payload.get("errors"):
+        print(f"❌ Failed to update repository: {response.status_code}")
+        print(f"   {json.dumps(payload.get('errors')) if payload else response.text}")
         return False
+    
+    print(f"✅ Description set: {description}")
+    print(f"✅ Topics set ({len(topics)} topics):")
+    for topic in topics:
+        print(f"   - {topic}")
+    return True
 
 
 def main():
@@ -154,17 +197,14 @@ def main():
     
     token = get_token()
     
-    # Set description
-    print("Setting description...")
-    desc_success = set_repo_description(token, DESCRIPTION)
-    print()
-    
-    # Set topics
-    print("Setting topics...")
-    topics_success = set_repo_topics(token, TOPICS)
-    print()
+    with create_session(token) as session:
+        repo_id = get_repo_id(session)
+        
+        print("Setting description and topics...")
+        success = repo_id is not None and set_repo_info(session, repo_id, DESCRIPTION, TOPICS)
+        print()
     
-    if desc_success and topics_success:
+    if success:
         print("✅ Successfully updated repository information!")
         print(f"\nView your repo: https://github.com/{REPO_OWNER}/{REPO_NAME}")
     else:
@@ -1,16 +1,63 @@
 """
 Pytest configuration and shared fixtures.
+
+Fixtures that only create read-only inputs (credentials, metadata JSON, sample
+zip) are session-scoped and built once; tests must not modify those files.
+Under pytest-xdist each worker has its own base temp directory, so workers build
+their own copies and never write to the same file.
 """
-import json
+import copy
+import io
+import os
 import tempfile
 import zipfile
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Dict
-from unittest.mock import Mock
+from unittest.mock import Mock, create_autospec, patch
 
 import pytest
 import yaml
 
+from google_photos_icloud_migration.config import YamlSafeDumper
+from google_photos_icloud_migration.utils.json_io import dumps_json
+
+
+# Sample configuration; paths are filled in per test by sample_config
+_SAMPLE_CONFIG_TEMPLATE = {
+    'google_drive': {
+        'credentials_file': None,
+        'folder_id': 'test_folder_id',
+        'zip_file_pattern': 'takeout-*.zip'
+    },
+    'icloud': {
+        'apple_id': 'test@example.com',
+        'password': '',
+        'trusted_device_id': None,
+        'two_fa_code': None
+    },
+    'processing': {
+        'base_dir': None,
+        'zip_dir': 'zips',
+        'extracted_dir': 'extracted',
+        'processed_dir': 'processed',
+        'batch_size': 10,
+        'cleanup_after_upload': False,
+        'enable_parallel_processing': True,
+        'max_workers': 2
+    },
+    'metadata': {
+        'preserve_dates': True,
+        'preserve_gps': True,
+        'preserve_descriptions': True,
+        'preserve_albums': True
+    },
+    'logging': {
+        'level': 'INFO',
+        'file': 'migration.log'
+    }
+}
+
 
 @pytest.fixture
 def tmp_dir(tmp_path):
@@ -19,41 +66,27 @@ def tmp_dir(tmp_path):
 
 
 @pytest.fixture
-def sample_config(tmp_path) -> Dict:
+def make_dirs():
+    """Provide a helper that creates several directories (and their parents) in one call."""
+    def _make_dirs(*paths):
+        for path in paths:
+            os.makedirs(path, exist_ok=True)
+    return _make_dirs
+
+
+@pytest.fixture(scope="session")
+def _sample_config_template() -> Dict:
+    """Sample configuration template (without paths) for class- or module-scoped fixtures."""
+    return _SAMPLE_CONFIG_TEMPLATE
+
+
+@pytest.fixture
+def sample_config(tmp_path, credentials_file) -> Dict:
     """Fixture providing a sample configuration dictionary."""
-    return {
-        'google_drive': {
-            'credentials_file': str(tmp_path / 'credentials.json'),
-            'folder_id': 'test_folder_id',
-            'zip_file_pattern': 'takeout-*.zip'
-        },
-        'icloud': {
-            'apple_id': 'test@example.com',
-            'password': '',
-            'trusted_device_id': None,
-            'two_fa_code': None
-        },
-        'processing': {
-            'base_dir': str(tmp_path / 'migration'),
-            'zip_dir': 'zips',
-            'extracted_dir': 'extracted',
-            'processed_dir': 'processed',
-            'batch_size': 10,
-            'cleanup_after_upload': False,
-            'enable_parallel_processing': True,
-            'max_workers': 2
-        },
-        'metadata': {
-            'preserve_dates': True,
-            'preserve_gps': True,
-            'preserve_descriptions': True,
-            'preserve_albums': True
-        },
-        'logging': {
-            'level': 'INFO',
-            'file': 'migration.log'
-        }
-    }
+    config = copy.deepcopy(_SAMPLE_CONFIG_TEMPLATE)
+    config['google_drive']['credentials_file'] = str(credentials_file)
+    config['processing']['base_dir'] = str(tmp_path / 'migration')
+    return config
 
 
 @pytest.fixture
@@ -61,14 +94,14 @@ def config_file(tmp_path, sample_config) -> Path:
     """Create a temporary config.yaml file."""
     config_path = tmp_path / 'config.yaml'
     with open(config_path, 'w') as f:
-        yaml.dump(sample_config, f)
+        yaml.dump(sample_config, f, Dumper=YamlSafeDumper)
     return config_path
 
 
-@pytest.fixture
-def credentials_file(tmp_path) -> Path:
+@pytest.fixture(scope="session")
+def credentials_file(tmp_path_factory) -> Path:
     """Create a mock credentials.json file."""
-    creds_file = tmp_path / 'credentials.json'
+    creds_file = tmp_path_factory.mktemp('credentials') / 'credentials.json'
     creds_data = {
         'installed': {
             'client_id': 'test_client_id',
@@ -78,15 +111,14 @@ def credentials_file(tmp_path) -> Path:
             'redirect_uris': ['http://localhost']
         }
     }
-    with open(creds_file, 'w') as f:
-        json.dump(creds_data, f)
+    creds_file.write_bytes(dumps_json(creds_data))
     return creds_file
 
 
-@pytest.fixture
-def sample_metadata_json(tmp_path) -> Path:
+@pytest.fixture(scope="session")
+def sample_metadata_json(tmp_path_factory) -> Path:
     """Create a sample metadata JSON file."""
-    metadata_file = tmp_path / 'sample.json'
+    metadata_file = tmp_path_factory.mktemp('metadata') / 'sample.json'
     metadata = {
         'title': 'Test Photo',
         'photoTakenTime': {
@@ -99,56 +131,66 @@ def sample_metadata_json(tmp_path) -> Path:
         },
         'description': 'Test description'
     }
-    with open(metadata_file, 'w') as f:
-        json.dump(metadata, f)
+    metadata_file.write_bytes(dumps_json(metadata))
     return metadata_file
 
 
-@pytest.fixture
-def sample_zip_file(tmp_path) -> Path:
+@pytest.fixture(scope="session")
+def sample_zip_file(tmp_path_factory) -> Path:
     """Create a sample zip file with test content."""
-    zip_path = tmp_path / 'test.zip'
-    with zipfile.ZipFile(zip_path, 'w') as zf:
+    metadata = {
+        'title': 'Test Photo',
+        'photoTakenTime': {'timestamp': '1609459200'}
+    }
+    metadata_bytes = dumps_json(metadata)
+    # Assemble the archive in memory and write it out once. Members are stored
+    # uncompressed; the content is tiny and compression adds nothing
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as zf:
         # Add a sample image file
         zf.writestr('Takeout/Photos/test.jpg', b'fake image data')
         # Add corresponding JSON metadata
-        metadata = {
-            'title': 'Test Photo',
-            'photoTakenTime': {'timestamp': '1609459200'}
-        }
-        zf.writestr('Takeout/Photos/test.jpg.json', json.dumps(metadata))
+        zf.writestr('Takeout/Photos/test.jpg.json', metadata_bytes)
         # Add another file
         zf.writestr('Takeout/Photos/test2.jpg', b'fake image data 2')
+    zip_path = tmp_path_factory.mktemp('zips') / 'test.zip'
+    zip_path.write_bytes(buffer.getvalue())
     return zip_path
 
 
+# Response of the mocked Drive files().list() call
+_DRIVE_FILES_LIST_RESPONSE = {
+    'files': [
+        {
+            'id': 'file1',
+            'name': 'takeout-001.zip',
+            'size': '1024000',
+            'mimeType': 'application/zip'
+        },
+        {
+            'id': 'file2',
+            'name': 'takeout-002.zip',
+            'size': '2048000',
+            'mimeType': 'application/zip'
+        }
+    ],
+    'nextPageToken': None
+}
+
+
 @pytest.fixture
 def mock_drive_service():
-    """Create a mock Google Drive service."""
-    service = Mock()
-    
-    # Mock files list response
-    files_list = Mock()
-    files_list.execute.return_value = {
-        'files': [
-            {
-                'id': 'file1',
-                'name': 'takeout-001.zip',
-                'size': '1024000',
-                'mimeType': 'application/zip'
-            },
-            {
-                'id': 'file2',
-                'name': 'takeout-002.zip',
-                'size': '2048000',
-                'mimeType': 'application/zip'
-            }
-        ],
-        'nextPageToken': None
-    }
+    """
+    Create a stub Google Drive service.
     
-    service.files.return_value.list.return_value = files_list
-    return service
+    Plain namespaces and lambdas are used instead of Mock since no test asserts
+    on these calls; use a Mock in the test itself when call arguments matter.
+    """
+    files = SimpleNamespace(
+        list=lambda **kwargs: SimpleNamespace(execute=lambda: _DRIVE_FILES_LIST_RESPONSE),
+        get_media=lambda **kwargs: SimpleNamespace(**kwargs)
+    )
+    return SimpleNamespace(files=lambda: files)
 
 
 @pytest.fixture
@@ -158,3 +200,50 @@ def mock_photo_library():
     library.authorizationStatus.return_value = 3  # Authorized
     return library
 
+
+
+# Orchestrator components replaced by patched_components, keyed by the name the
+# fixture exposes their instances under
+_ORCHESTRATOR_COMPONENTS = {
+    'downloader': 'DriveDownloader',
+    'extractor': 'Extractor',
+    'merger': 'MetadataMerger',
+    'parser': 'AlbumParser',
+    'uploader': 'iCloudPhotosSyncUploader',
+    'state_manager': 'StateManager',
+}
+
+
+@pytest.fixture(scope="session")
+def _component_specs():
+    """Autospecced mocks of the orchestrator's component classes, built once per session."""
+    # Imported here so collecting tests that don't patch components stays cheap
+    from google_photos_icloud_migration import orchestrator
+    return {
+        name: create_autospec(getattr(orchestrator, name))
+        for name in _ORCHESTRATOR_COMPONENTS.values()
+    }
+
+
+@pytest.fixture
+def patched_components(_component_specs):
+    """
+    Patch the orchestrator's components for one test.
+    
+    autospec checks every configured method against the real classes. The specs
+    are built once per session and only tests that ask for this fixture are
+    patched. Calls, return values and side effects are reset before each test;
+    attributes assigned directly on the shared mocks are not, so configure
+    methods only (check constructor arguments through the patched classes).
+    
+    Yields a namespace of the mocked component instances (downloader, extractor,
+    merger, parser, uploader, state_manager).
+    """
+    for mock_class in _component_specs.values():
+        mock_class.reset_mock()
+        mock_class.return_value.reset_mock(return_value=True, side_effect=True)
+    with patch.multiple('google_photos_icloud_migration.orchestrator', **_component_specs):
+        yield SimpleNamespace(**{
+            key: _component_specs[name].return_value
+            for key, name in _ORCHESTRATOR_COMPONENTS.items()
+        })
@@ -6,37 +6,35 @@ import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch
 
-# Example: Test for extractor module
-def test_extractor_initialization():
-    """Test that Extractor can be initialized."""
+# Example: Shared setup in a fixture
+@pytest.fixture
+def extractor(tmp_path):
+    """Fixture providing an Extractor rooted in the test's temporary directory."""
     from google_photos_icloud_migration.processor.extractor import Extractor
     
-    base_dir = Path("/tmp/test-extraction")
-    extractor = Extractor(base_dir)
-    
-    assert extractor.base_dir == base_dir
-    assert extractor.extracted_dir == base_dir / "extracted"
+    return Extractor(tmp_path)
+
+
+# Example: Test for extractor module
+def test_extractor_initialization(extractor, tmp_path):
+    """Test that Extractor can be initialized."""
+    assert extractor.base_dir == tmp_path
+    assert extractor.extracted_dir == tmp_path / "extracted"
 
 
-def test_extractor_extracted_dir_created(tmp_path):
+def test_extractor_extracted_dir_created(extractor):
     """Test that extracted directory is created."""
-    from google_photos_icloud_migration.processor.extractor import Extractor
-    
-    extractor = Extractor(tmp_path)
     assert extractor.extracted_dir.exists()
 
 
 @patch('google_photos_icloud_migration.processor.extractor.zipfile.ZipFile')
-def test_extract_zip_file(mock_zipfile, tmp_path):
+def test_extract_zip_file(mock_zipfile, extractor, tmp_path):
     """Test zip file extraction with mocked zipfile."""
-    from google_photos_icloud_migration.processor.extractor import Extractor
-    
     # Create mock zip file
     mock_zip = Mock()
     mock_zipfile.return_value.__enter__.return_value = mock_zip
     mock_zip.namelist.return_value = ['file1.jpg', 'file1.json']
     
-    extractor = Extractor(tmp_path)
     zip_path = tmp_path / "test.zip"
     zip_path.touch()  # Create empty file
     
@@ -46,12 +44,10 @@ def test_extract_zip_file(mock_zipfile, tmp_path):
 
 
 # Example: Test error handling
-def test_invalid_zip_file(tmp_path):
+def test_invalid_zip_file(extractor, tmp_path):
     """Test that invalid zip files are handled gracefully."""
-    from google_photos_icloud_migration.processor.extractor import Extractor
     from google_photos_icloud_migration.exceptions import ExtractionError
     
-    extractor = Extractor(tmp_path)
     invalid_zip = tmp_path / "not-a-zip.txt"
     invalid_zip.write_text("This is not a zip file")
     
@@ -60,25 +56,20 @@ def test_invalid_zip_file(tmp_path):
         extractor.extract_zip(invalid_zip)
 
 
-# Example: Test with fixtures
-@pytest.fixture
-def sample_config(tmp_path):
-    """Fixture providing a sample configuration."""
-    config = {
-        'processing': {
-            'base_dir': str(tmp_path),
-            'batch_size': 10,
-        },
-        'metadata': {
-            'preserve_dates': True,
-            'preserve_gps': True,
-        }
+# Example: Pure-logic tests use a constant instead of a fixture, so no tmp_path
+# directory is created for tests that never touch the disk
+NO_DISK_CONFIG = {
+    'processing': {
+        'base_dir': '/tmp/google-photos-migration',
+        'batch_size': 10,
+    },
+    'metadata': {
+        'preserve_dates': True,
+        'preserve_gps': True,
     }
-    return config
+}
 
 
-def test_config_loading(sample_config):
+def test_config_loading():
     """Test configuration loading."""
-    # Example test using fixture
-    assert sample_config['processing']['batch_size'] == 10
-
+    assert NO_DISK_CONFIG['processing']['batch_size'] == 10
@@ -0,0 +1,20 @@
+"""
+Shared fixtures for integration tests.
+"""
+import pytest
+
+
+@pytest.fixture
+def orchestrator(sample_config, patched_components):
+    """
+    Build a fresh orchestrator for each test on top of the patched components.
+
+    The orchestrator is built from sample_config, so every test gets its own
+    base_dir under tmp_path. Tests configure behaviour through
+    patched_components; the orchestrator holds the same mock instances.
+    """
+    # Imported here rather than at module level so collecting the integration
+    # tests does not load the whole application
+    from scripts.main import MigrationOrchestrator
+
+    return MigrationOrchestrator(sample_config)
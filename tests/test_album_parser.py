@@ -8,6 +8,24 @@ import pytest
 from google_photos_icloud_migration.parser.album_parser import AlbumParser
 
 
+@pytest.fixture(scope="module")
+def album_tree(tmp_path_factory):
+    """
+    Build one Takeout-style album tree per module.
+    
+    Parsers are cheap to create, so tests share the tree and make their own
+    AlbumParser. File contents are never read, so empty files are enough.
+    """
+    root = tmp_path_factory.mktemp("albums")
+    for relative in ('Album1/photo1.jpg', 'Album1/photo2.jpg', 'Album2/photo3.jpg',
+                     'Album/photo.jpg', 'Album/readme.txt',
+                     'TestAlbum/photo1.jpg', 'TestAlbum/photo2.jpg'):
+        path = root / relative
+        path.parent.mkdir(exist_ok=True)
+        path.touch()
+    return root
+
+
 class TestAlbumParser:
     """Test cases for AlbumParser class."""
     
@@ -18,37 +36,22 @@ class TestAlbumParser:
         assert parser.albums == {}
         assert parser.file_to_album == {}
     
-    def test_parse_from_directory_structure(self, tmp_path):
+    def test_parse_from_directory_structure(self, album_tree):
         """Test parsing album structure from directory hierarchy."""
         parser = AlbumParser()
         
-        # Create directory structure simulating Google Takeout
-        album1_dir = tmp_path / 'Album1'
-        album1_dir.mkdir()
-        (album1_dir / 'photo1.jpg').write_bytes(b'fake image')
-        (album1_dir / 'photo2.jpg').write_bytes(b'fake image')
-        
-        album2_dir = tmp_path / 'Album2'
-        album2_dir.mkdir()
-        (album2_dir / 'photo3.jpg').write_bytes(b'fake image')
-        
-        albums = parser.parse_from_directory_structure(tmp_path)
+        albums = parser.parse_from_directory_structure(album_tree)
         
         assert 'Album1' in albums
         assert 'Album2' in albums
         assert len(albums['Album1']) == 2
         assert len(albums['Album2']) == 1
     
-    def test_parse_from_directory_structure_case_insensitive(self, tmp_path):
+    def test_parse_from_directory_structure_case_insensitive(self, album_tree):
         """Test that album parsing is case-insensitive."""
         parser = AlbumParser()
         
-        # Create directories with different cases
-        album1_dir = tmp_path / 'Album1'
-        album1_dir.mkdir()
-        (album1_dir / 'photo1.jpg').write_bytes(b'fake image')
-        
-        albums = parser.parse_from_directory_structure(tmp_path)
+        albums = parser.parse_from_directory_structure(album_tree)
         
         # Should find album regardless of case
         assert len(albums) > 0
@@ -68,34 +71,28 @@ class TestAlbumParser:
             # Should remove common prefixes
             assert cleaned == expected or expected in cleaned
     
-    def test_file_to_album_mapping(self, tmp_path):
+    def test_file_to_album_mapping(self, album_tree):
         """Test that file_to_album mapping is created correctly."""
         parser = AlbumParser()
         
-        album_dir = tmp_path / 'TestAlbum'
-        album_dir.mkdir()
+        album_dir = album_tree / 'TestAlbum'
         photo1 = album_dir / 'photo1.jpg'
         photo2 = album_dir / 'photo2.jpg'
-        photo1.write_bytes(b'fake image')
-        photo2.write_bytes(b'fake image')
         
-        parser.parse_from_directory_structure(tmp_path)
+        parser.parse_from_directory_structure(album_tree)
         
         assert photo1 in parser.file_to_album
         assert photo2 in parser.file_to_album
         assert parser.file_to_album[photo1] == 'TestAlbum'
         assert parser.file_to_album[photo2] == 'TestAlbum'
     
-    def test_parse_ignores_non_media_files(self, tmp_path):
+    def test_parse_ignores_non_media_files(self, album_tree):
         """Test that non-media files are ignored."""
         parser = AlbumParser()
         
-        album_dir = tmp_path / 'Album'
-        album_dir.mkdir()
-        (album_dir / 'photo.jpg').write_bytes(b'fake image')
-        (album_dir / 'readme.txt').write_text('not an image')
+        album_dir = album_tree / 'Album'
         
-        albums = parser.parse_from_directory_structure(tmp_path)
+        albums = parser.parse_from_directory_structure(album_tree)
         
         # Should only include media files
         assert len(albums['Album']) == 1
@@ -91,6 +91,11 @@ class TestProcessingConfig:
         """Test validation with invalid batch size."""
         with pytest.raises(ValueError, match="batch_size must be at least 1"):
             ProcessingConfig(base_dir="/tmp/test", batch_size=0)
+    
+    def test_processing_config_negative_disk_limit(self):
+        """Test validation with a negative disk space limit."""
+        with pytest.raises(ValueError, match="max_disk_space_gb cannot be negative"):
+            ProcessingConfig(base_dir="/tmp/test", max_disk_space_gb=-1)
 
 
 class TestMetadataConfig:
@@ -178,6 +183,25 @@ class TestMigrationConfig:
         config = MigrationConfig.from_yaml(str(config_file), validate=True)
         assert isinstance(config, MigrationConfig)
     
+    def test_migration_config_from_mapping(self, tmp_path):
+        """Test loading config from an in-memory dictionary without a file."""
+        config_dict = {
+            "google_drive": {
+                "credentials_file": "credentials.json",
+                "zip_file_pattern": "takeout-*.zip"
+            },
+            "processing": {
+                "base_dir": str(tmp_path),
+                "batch_size": 50
+            }
+        }
+        
+        config = MigrationConfig.from_mapping(config_dict, validate=True)
+        assert isinstance(config, MigrationConfig)
+        assert config.processing.batch_size == 50
+        # The caller's dictionary is left untouched
+        assert "icloud" not in config_dict
+    
     def test_migration_config_from_yaml_invalid_schema(self, tmp_path):
         """Test loading config with invalid schema."""
         config_dict = {
@@ -99,13 +99,10 @@ class TestDriveDownloader:
         self._setup_oauth_mocks(mock_flow, mock_creds, mock_exists, mock_build, mock_drive_service)
         
         # Mock file download
-        mock_request = Mock()
         mock_download_obj = Mock()
         mock_download_obj.next_chunk.return_value = (None, True)
         mock_download.return_value = mock_download_obj
         
-        mock_drive_service.files.return_value.get_media.return_value = mock_request
-        
         downloader = DriveDownloader(str(credentials_file))
         output_path = tmp_path / 'downloaded.zip'
         
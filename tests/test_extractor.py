@@ -3,6 +3,7 @@ Tests for extractor.py module.
 """
 import zipfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -93,3 +94,124 @@ class TestExtractor:
         assert (extracted_dir / 'Takeout' / 'Album1' / 'photo1.jpg').exists()
         assert (extracted_dir / 'Takeout' / 'Album2' / 'photo2.jpg').exists()
 
+    
+    def test_identify_media_json_pairs_matches_sidecars(self, tmp_path):
+        """Test that JSON sidecars are matched per directory."""
+        extractor = Extractor(tmp_path)
+        
+        media_dir = tmp_path / 'media'
+        (media_dir / 'Album1').mkdir(parents=True)
+        (media_dir / 'photo1.jpg').write_bytes(b'fake image')
+        (media_dir / 'photo1.json').write_text('{"title": "Photo 1"}')
+        (media_dir / 'photo2.jpg').write_bytes(b'fake image')
+        (media_dir / 'Album1' / 'photo3.png').write_bytes(b'fake image')
+        (media_dir / 'Album1' / 'photo3.json').write_text('{"title": "Photo 3"}')
+        
+        pairs = extractor.identify_media_json_pairs(media_dir)
+        
+        assert pairs[media_dir / 'photo1.jpg'] == media_dir / 'photo1.json'
+        assert pairs[media_dir / 'photo2.jpg'] is None
+        assert pairs[media_dir / 'Album1' / 'photo3.png'] == media_dir / 'Album1' / 'photo3.json'
+    
+    def test_find_media_files_filters_entries(self, tmp_path):
+        """Test that media discovery matches extensions and skips junk files."""
+        extractor = Extractor(tmp_path)
+        
+        media_dir = tmp_path / 'media'
+        (media_dir / 'Album' / 'Nested').mkdir(parents=True)
+        (media_dir / '__MACOSX').mkdir()
+        (media_dir / 'photo.JPG').write_bytes(b'fake image')
+        (media_dir / 'Album' / 'clip.mov').write_bytes(b'fake video')
+        (media_dir / 'Album' / 'Nested' / 'photo.heic').write_bytes(b'fake image')
+        (media_dir / 'Album' / 'photo.jpg.json').write_text('{}')
+        (media_dir / 'Album' / '._photo.jpg').write_bytes(b'resource fork')
+        (media_dir / '__MACOSX' / 'photo.jpg').write_bytes(b'resource fork')
+        
+        found = set(extractor.find_media_files(media_dir))
+        
+        assert found == {
+            media_dir / 'photo.JPG',
+            media_dir / 'Album' / 'clip.mov',
+            media_dir / 'Album' / 'Nested' / 'photo.heic',
+        }
+    
+    def test_extract_zip_sets_secure_permissions(self, sample_zip_file, tmp_path):
+        """Test that extracted files and directories get owner-only permissions."""
+        extractor = Extractor(tmp_path)
+        extracted_dir = extractor.extract_zip(sample_zip_file)
+        
+        photo = extracted_dir / 'Takeout' / 'Photos' / 'test.jpg'
+        assert photo.stat().st_mode & 0o777 == 0o600
+        assert extracted_dir.stat().st_mode & 0o777 == 0o700
+    
+    def test_extract_zip_detects_truncated_entry(self, tmp_path):
+        """Test that entries extending past the end of the file are rejected."""
+        import struct
+        from google_photos_icloud_migration.exceptions import ExtractionError
+        zip_path = tmp_path / 'truncated.zip'
+        with zipfile.ZipFile(zip_path, 'w') as zf:
+            zf.writestr('photo.jpg', b'fake image data')
+        
+        # Point the central directory's compressed size far past the end of the file
+        data = bytearray(zip_path.read_bytes())
+        cd_offset = data.index(b'PK\x01\x02')
+        struct.pack_into('<I', data, cd_offset + 20, 10 * 1024 * 1024)
+        zip_path.write_bytes(bytes(data))
+        
+        extractor = Extractor(tmp_path)
+        with pytest.raises(ExtractionError, match='truncated'):
+            extractor.extract_zip(zip_path)
+    
+    def test_deep_validation_is_opt_in(self, sample_zip_file, tmp_path):
+        """Test that testzip() only runs when deep validation is enabled."""
+        with patch.object(zipfile.ZipFile, 'testzip', return_value=None) as testzip:
+            Extractor(tmp_path / 'default').extract_zip(sample_zip_file)
+            assert not testzip.called
+            
+            Extractor(tmp_path / 'deep', deep_validation=True).extract_zip(sample_zip_file)
+            assert testzip.called
+    
+    def test_validate_zip(self, sample_zip_file, tmp_path):
+        """Test validating a zip file without extracting it."""
+        from google_photos_icloud_migration.exceptions import ExtractionError
+        extractor = Extractor(tmp_path)
+        extractor.validate_zip(sample_zip_file)
+        assert not any(extractor.extracted_dir.iterdir())
+        
+        invalid_zip = tmp_path / 'invalid.zip'
+        invalid_zip.write_bytes(b'not a zip')
+        with pytest.raises(ExtractionError):
+            extractor.validate_zip(invalid_zip)
+    
+    def test_extract_zip_parallel(self, tmp_path):
+        """Test that parallel extraction writes the same files as extract_zip."""
+        zip_path = tmp_path / 'many.zip'
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('Takeout/Album/', b'')
+            for i in range(20):
+                zf.writestr(f'Takeout/Album {i % 3}/photo_{i}.jpg', bytes([i]) * (i * 100 + 1))
+        
+        extractor = Extractor(tmp_path)
+        extracted_dir = extractor.extract_zip_parallel(zip_path, max_workers=4)
+        
+        with zipfile.ZipFile(zip_path) as zf:
+            for info in zf.infolist():
+                target = extracted_dir / info.filename
+                if info.is_dir():
+                    assert target.is_dir()
+                else:
+                    assert target.read_bytes() == zf.read(info)
+                    assert target.stat().st_mode & 0o777 == 0o600
+        assert extracted_dir.stat().st_mode & 0o777 == 0o700
+    
+    def test_extract_zip_parallel_rejects_zip_slip(self, tmp_path):
+        """Test that entries outside the extraction directory are rejected."""
+        from google_photos_icloud_migration.exceptions import ExtractionError
+        zip_path = tmp_path / 'slip.zip'
+        with zipfile.ZipFile(zip_path, 'w') as zf:
+            zf.writestr('../outside.jpg', b'fake image data')
+        
+        extractor = Extractor(tmp_path)
+        with pytest.raises(ExtractionError, match='zip slip'):
+            extractor.extract_zip_parallel(zip_path)
+        assert not (extractor.extracted_dir / 'outside.jpg').exists()
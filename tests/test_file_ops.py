@@ -0,0 +1,124 @@
+"""
+Tests for file system helpers.
+"""
+import pytest
+
+from google_photos_icloud_migration.utils.file_ops import (
+    dir_has_entries,
+    directory_size,
+    remove_tree,
+    unlink_files,
+)
+
+
+class TestUnlinkFiles:
+    """Tests for unlink_files function."""
+
+    def test_deletes_files(self, tmp_path):
+        """Test that all files are deleted concurrently."""
+        paths = []
+        for i in range(20):
+            path = tmp_path / f'photo_{i}.jpg'
+            path.write_bytes(b'data')
+            paths.append(path)
+
+        removed, errors = unlink_files(paths, max_workers=4)
+
+        assert removed == 20
+        assert errors == {}
+        assert not any(path.exists() for path in paths)
+
+    def test_missing_files_are_not_errors(self, tmp_path):
+        """Test that files that are already gone count as removed."""
+        removed, errors = unlink_files([tmp_path / 'missing.jpg'])
+
+        assert removed == 1
+        assert errors == {}
+
+    def test_reports_errors(self, tmp_path):
+        """Test that files that cannot be deleted are reported."""
+        directory = tmp_path / 'not_a_file'
+        directory.mkdir()
+        photo = tmp_path / 'photo.jpg'
+        photo.write_bytes(b'data')
+
+        removed, errors = unlink_files([directory, photo])
+
+        assert removed == 1
+        assert list(errors) == [directory]
+        assert isinstance(errors[directory], OSError)
+
+    def test_empty_list(self):
+        """Test that an empty list is a no-op."""
+        assert unlink_files([]) == (0, {})
+
+
+class TestRemoveTree:
+    """Tests for remove_tree function."""
+
+    def test_removes_nested_tree(self, tmp_path):
+        """Test that files and nested directories are all removed."""
+        root = tmp_path / 'extracted'
+        nested = root / 'Takeout' / 'Google Photos' / 'Album'
+        nested.mkdir(parents=True)
+        (root / 'Takeout' / 'archive_browser.html').write_text('html')
+        for i in range(5):
+            (nested / f'photo_{i}.jpg').write_bytes(b'data')
+        (root / 'empty').mkdir()
+
+        remove_tree(root)
+
+        assert not root.exists()
+
+    def test_does_not_follow_symlinks(self, tmp_path):
+        """Test that symlinked directories are unlinked, not traversed."""
+        outside = tmp_path / 'outside'
+        outside.mkdir()
+        keep = outside / 'keep.jpg'
+        keep.write_bytes(b'data')
+        root = tmp_path / 'extracted'
+        root.mkdir()
+        (root / 'link').symlink_to(outside, target_is_directory=True)
+
+        remove_tree(root)
+
+        assert not root.exists()
+        assert keep.exists()
+
+    def test_missing_directory_raises(self, tmp_path):
+        """Test that a missing directory raises like shutil.rmtree."""
+        with pytest.raises(FileNotFoundError):
+            remove_tree(tmp_path / 'missing')
+
+
+class TestDirHasEntries:
+    """Tests for dir_has_entries function."""
+
+    def test_empty_and_non_empty(self, tmp_path):
+        """Test detection of empty and non-empty directories."""
+        assert not dir_has_entries(tmp_path)
+
+        (tmp_path / 'photo.jpg').write_bytes(b'data')
+
+        assert dir_has_entries(tmp_path)
+
+    def test_missing_directory(self, tmp_path):
+        """Test that a missing directory counts as empty."""
+        assert not dir_has_entries(tmp_path / 'missing')
+
+
+class TestDirectorySize:
+    """Tests for directory_size function."""
+
+    def test_sums_nested_files(self, tmp_path):
+        """Test that file sizes are summed across subdirectories."""
+        (tmp_path / 'a.zip').write_bytes(b'x' * 100)
+        nested = tmp_path / 'extracted' / 'Takeout'
+        nested.mkdir(parents=True)
+        (nested / 'photo.jpg').write_bytes(b'x' * 50)
+
+        assert directory_size(tmp_path) == 150
+
+    def test_missing_directory(self, tmp_path):
+        """Test that a missing directory has size 0."""
+        assert directory_size(tmp_path / 'missing') == 0
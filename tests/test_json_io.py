@@ -0,0 +1,111 @@
+"""
+Tests for JSON serialization helpers.
+"""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from google_photos_icloud_migration.utils import json_io
+from google_photos_icloud_migration.utils.json_io import dumps_json, loads_json, read_json, write_json
+
+
+class TestDumpsJson:
+    """Tests for dumps_json function."""
+
+    def test_returns_bytes(self):
+        """Test that serialization produces UTF-8 bytes."""
+        data = {'file': '/tmp/photo.jpg', 'album': 'Vacation', 'retry_count': 1}
+        result = dumps_json(data)
+
+        assert isinstance(result, bytes)
+        assert json.loads(result) == data
+
+    def test_stdlib_fallback(self):
+        """Test serialization without orjson installed."""
+        data = {'photo.jpg': {'album': 'Café', 'retry_count': 0}}
+        with patch.object(json_io, 'ORJSON_AVAILABLE', False):
+            result = dumps_json(data)
+
+        assert json.loads(result.decode('utf-8')) == data
+
+    def test_output_is_indented(self):
+        """Test that output remains human-readable."""
+        result = dumps_json({'a': {'b': 1}})
+
+        assert b'\n  "a"' in result
+
+
+class TestLoadsJson:
+    """Tests for loads_json function."""
+
+    def test_round_trip(self):
+        """Test that serialized data parses back unchanged."""
+        data = {'zip_1.zip': {'state': 'uploaded', 'files': ['Café.jpg']}}
+
+        assert loads_json(dumps_json(data)) == data
+
+    def test_stdlib_fallback(self):
+        """Test parsing without orjson installed."""
+        with patch.object(json_io, 'ORJSON_AVAILABLE', False):
+            assert loads_json(b'{"a": [1, 2]}') == {'a': [1, 2]}
+
+    def test_invalid_json_raises_json_decode_error(self):
+        """Test that invalid input raises the standard decode error."""
+        with pytest.raises(json.JSONDecodeError):
+            loads_json(b'{"a": ')
+
+
+class TestReadJson:
+    """Tests for read_json function."""
+
+    def test_read_json(self, tmp_path):
+        """Test reading a file written by write_json."""
+        path = tmp_path / 'corrupted_zips.json'
+        data = {'abc123': {'file_name': 'takeout-001.zip', 'local_size_mb': 12.5}}
+        write_json(path, data)
+
+        assert read_json(path) == data
+
+    def test_missing_file_raises_os_error(self, tmp_path):
+        """Test that a missing file raises OSError."""
+        with pytest.raises(OSError):
+            read_json(tmp_path / 'missing.json')
+
+
+class TestWriteJson:
+    """Tests for write_json function."""
+
+    def test_write_json(self, tmp_path):
+        """Test writing JSON data to a file."""
+        path = tmp_path / 'failed_uploads.json'
+        data = {'/tmp/photo.jpg': {'file': '/tmp/photo.jpg', 'album': '', 'retry_count': 0}}
+
+        write_json(path, data)
+
+        with open(path, 'r') as f:
+            assert json.load(f) == data
+
+    def test_write_json_replaces_atomically(self, tmp_path):
+        """Test that existing files are replaced and no temp file is left."""
+        path = tmp_path / 'failed_uploads.json'
+        path.write_text('{"old": true}')
+
+        write_json(path, {'new': True})
+
+        with open(path, 'r') as f:
+            assert json.load(f) == {'new': True}
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_write_json_keeps_original_on_error(self, tmp_path):
+        """Test that a failed write leaves the previous file intact."""
+        path = tmp_path / 'failed_uploads.json'
+        path.write_text('{"old": true}')
+
+        with patch.object(json_io.os, 'replace', side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                write_json(path, {'new': True})
+
+        assert path.read_text() == '{"old": true}'
+        assert not path.with_name(f"{path.name}.tmp").exists()
+        assert list(tmp_path.iterdir()) == [path]
@@ -25,33 +25,38 @@ from google_photos_icloud_migration.orchestrator import MigrationOrchestrator
 
 
 
+@pytest.mark.usefixtures("patched_components")
 class TestMigrationOrchestrator:
-    """Test cases for MigrationOrchestrator class."""
+    """
+    Test cases for MigrationOrchestrator class.
+
+    patched_components replaces every component the orchestrator builds,
+    including StateManager and the uploader, so these tests never touch
+    PhotoKit or write real state files.
+    """
     
     def test_initialization(self, config_file):
         """Test that MigrationOrchestrator can be initialized."""
-        with patch('google_photos_icloud_migration.orchestrator.DriveDownloader'), \
-             patch('google_photos_icloud_migration.orchestrator.Extractor'), \
-             patch('google_photos_icloud_migration.orchestrator.MetadataMerger'), \
-             patch('google_photos_icloud_migration.orchestrator.AlbumParser'):
-            
-            orchestrator = MigrationOrchestrator(str(config_file))
-            
-            assert orchestrator.config_path == str(config_file)
-            assert orchestrator.config is not None
-            assert orchestrator.base_dir.exists()
+        orchestrator = MigrationOrchestrator(str(config_file))
+        
+        assert orchestrator.config_path == str(config_file)
+        assert orchestrator.config is not None
+        assert orchestrator.base_dir.exists()
+    
+    def test_initialization_from_mapping(self, sample_config):
+        """Test that MigrationOrchestrator can be initialized from a loaded configuration."""
+        orchestrator = MigrationOrchestrator(sample_config)
+        
+        assert orchestrator.config_path is None
+        assert orchestrator.base_dir == Path(sample_config['processing']['base_dir'])
+        assert orchestrator.base_dir.exists()
     
     def test_load_config(self, config_file, sample_config):
         """Test configuration loading."""
-        with patch('google_photos_icloud_migration.orchestrator.DriveDownloader'), \
-             patch('google_photos_icloud_migration.orchestrator.Extractor'), \
-             patch('google_photos_icloud_migration.orchestrator.MetadataMerger'), \
-             patch('google_photos_icloud_migration.orchestrator.AlbumParser'):
-            
-            orchestrator = MigrationOrchestrator(str(config_file))
-            
-            assert orchestrator.config['processing']['base_dir'] == sample_config['processing']['base_dir']
-            assert orchestrator.config['google_drive']['folder_id'] == sample_config['google_drive']['folder_id']
+        orchestrator = MigrationOrchestrator(str(config_file))
+        
+        assert orchestrator.config['processing']['base_dir'] == sample_config['processing']['base_dir']
+        assert orchestrator.config['google_drive']['folder_id'] == sample_config['google_drive']['folder_id']
     
     def test_load_config_with_defaults(self, tmp_path, sample_config):
         """Test that missing config values get defaults."""
@@ -65,22 +70,13 @@ class TestMigrationOrchestrator:
         with open(config_file, 'w') as f:
             yaml.dump(minimal_config, f)
         
-        with patch('google_photos_icloud_migration.orchestrator.DriveDownloader'), \
-             patch('google_photos_icloud_migration.orchestrator.Extractor'), \
-             patch('google_photos_icloud_migration.orchestrator.MetadataMerger'), \
-             patch('google_photos_icloud_migration.orchestrator.AlbumParser'):
-            
-            orchestrator = MigrationOrchestrator(str(config_file))
-            
-            # Should have defaults filled in
-            assert 'batch_size' in orchestrator.config['processing']
-            assert orchestrator.config['processing']['batch_size'] == 100
+        orchestrator = MigrationOrchestrator(str(config_file))
+        
+        # Should have defaults filled in
+        assert 'batch_size' in orchestrator.config['processing']
+        assert orchestrator.config['processing']['batch_size'] == 100
     
-    @patch('google_photos_icloud_migration.orchestrator.DriveDownloader')
-    @patch('google_photos_icloud_migration.orchestrator.Extractor')
-    @patch('google_photos_icloud_migration.orchestrator.MetadataMerger')
-    @patch('google_photos_icloud_migration.orchestrator.AlbumParser')
-    def test_setup_logging(self, mock_parser, mock_merger, mock_extractor, mock_downloader, config_file):
+    def test_setup_logging(self, config_file):
         """Test that logging is set up correctly."""
         orchestrator = MigrationOrchestrator(str(config_file))
         
@@ -173,3 +173,16 @@ class TestMetadataMerger:
         assert any('-Description=' in str(arg) or '-Caption-Abstract=' in str(arg) or '-UserComment=' in str(arg) for arg in args)
         assert any('Test description' in str(arg) for arg in args)
 
+    
+    @patch.object(MetadataMerger, '_check_exiftool')
+    def test_parse_json_metadata(self, mock_check, tmp_path, sample_metadata_json):
+        """Test that JSON sidecars are parsed and invalid ones yield an empty dict."""
+        merger = MetadataMerger(cache_metadata=False)
+        
+        with open(sample_metadata_json) as f:
+            expected = json.load(f)
+        assert merger.parse_json_metadata(sample_metadata_json) == expected
+        
+        invalid_json = tmp_path / 'invalid.json'
+        invalid_json.write_text('{not json')
+        assert merger.parse_json_metadata(invalid_json) == {}
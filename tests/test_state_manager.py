@@ -8,6 +8,7 @@ from unittest.mock import patch, mock_open
 from google_photos_icloud_migration.utils.state_manager import (
     StateManager,
     ZipProcessingState,
+    FileProcessingState,
 )
 
 
@@ -169,3 +170,99 @@ class TestStateManager:
         assert "failed1.zip" in failed
         assert "failed2.zip" in failed
         assert "success.zip" not in failed
+
+
+class TestZipStateIndex:
+    """Tests for the zip-by-state index used by get_zips_by_state."""
+    
+    def test_get_zips_by_state_tracks_transitions(self, tmp_path):
+        """Test that zips move between states in the index."""
+        manager = StateManager(tmp_path)
+        
+        manager.mark_zip_extracted("a.zip")
+        manager.mark_zip_extracted("b.zip")
+        manager.mark_zip_converted("a.zip")
+        
+        assert manager.get_zips_by_state(ZipProcessingState.CONVERTED) == ["a.zip"]
+        assert manager.get_zips_by_state(ZipProcessingState.EXTRACTED) == ["b.zip"]
+        
+        manager.mark_zip_uploaded("a.zip")
+        
+        assert manager.get_zips_by_state(ZipProcessingState.CONVERTED) == []
+        assert manager.get_zips_by_state(ZipProcessingState.UPLOADED) == ["a.zip"]
+    
+    def test_index_rebuilt_on_load(self, tmp_path):
+        """Test that the index is rebuilt from persisted state."""
+        manager = StateManager(tmp_path)
+        manager.mark_zip_converted("a.zip")
+        
+        reloaded = StateManager(tmp_path)
+        
+        assert reloaded.get_zips_by_state(ZipProcessingState.CONVERTED) == ["a.zip"]
+    
+    def test_index_cleared_with_state(self, tmp_path):
+        """Test that clearing state also clears the index."""
+        manager = StateManager(tmp_path)
+        manager.mark_zip_converted("a.zip")
+        
+        manager.clear_state()
+        
+        assert manager.get_zips_by_state(ZipProcessingState.CONVERTED) == []
+    
+    def test_snapshot(self, tmp_path):
+        """Test that snapshot maps every zip to its state value."""
+        manager = StateManager(tmp_path)
+        manager.mark_zip_converted("a.zip")
+        manager.mark_zip_uploaded("b.zip")
+        
+        snapshot = manager.snapshot()
+        manager.mark_zip_uploaded("a.zip")
+        
+        assert snapshot == {
+            "a.zip": ZipProcessingState.CONVERTED.value,
+            "b.zip": ZipProcessingState.UPLOADED.value,
+        }
+
+
+class TestBatchedWrites:
+    """Tests for batching state writes with begin_batch/end_batch."""
+    
+    def test_writes_deferred_until_end_batch(self, tmp_path):
+        """Test that state files are written once when the batch ends."""
+        manager = StateManager(tmp_path)
+        
+        manager.begin_batch()
+        manager.mark_zip_extracted("a.zip")
+        manager.mark_file_extracted("/tmp/photo.jpg", "a.zip")
+        
+        assert not manager.zip_state_file.exists()
+        assert not manager.file_state_file.exists()
+        
+        manager.end_batch()
+        
+        reloaded = StateManager(tmp_path)
+        assert reloaded.is_zip_extracted("a.zip")
+        assert reloaded.get_file_state("/tmp/photo.jpg") == FileProcessingState.EXTRACTED.value
+    
+    def test_nested_batches_flush_on_outermost(self, tmp_path):
+        """Test that only the outermost end_batch writes state."""
+        manager = StateManager(tmp_path)
+        
+        manager.begin_batch()
+        manager.begin_batch()
+        manager.mark_zip_converted("a.zip")
+        manager.end_batch()
+        
+        assert not manager.zip_state_file.exists()
+        
+        manager.end_batch()
+        
+        assert manager.zip_state_file.exists()
+    
+    def test_writes_immediately_without_batch(self, tmp_path):
+        """Test that state is still written on every change outside a batch."""
+        manager = StateManager(tmp_path)
+        
+        manager.mark_zip_converted("a.zip")
+        
+        assert manager.zip_state_file.exists()